@@ -4,295 +4,564 @@ Flask AWS Pricing Calculator Web Application
 A web application for querying AWS pricing information using the AWS Pricing API.
 """
 
-from flask import Flask, render_template, request, jsonify, session, Response
+from flask import Flask, render_template, request, jsonify, session, Response, stream_with_context
+from flask.json.provider import JSONProvider
+from flask_caching import Cache
+from flask_compress import Compress
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+from limits import parse_many
+from flask_session import Session
 from aws_pricing import AWSPricingClient
-from report_generator import generate_csv_report
+from report_generator import iter_csv_report, empty_csv_report
+from schemas import (
+    parse, EC2Query, RDSQuery, S3Query, VPCQuery, ALBQuery, Route53Query, CartItemRequest
+)
 import os
-import uuid
+import json
+import logging
+import secrets
+import decimal
+import functools
+import threading
+import orjson
+import redis
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson for request parsing and jsonify()
+
+    orjson keeps dict insertion order, so the id-indexed cart keeps items in
+    the order they were added when serialized into the cookie session.
+    orjson has no hooks, so loads() calls that pass any (such as the
+    object_hook the session serializer uses to restore tagged values) go
+    to the stdlib json module.
+    """
+
+    @staticmethod
+    def _default(obj):
+        if isinstance(obj, decimal.Decimal):
+            return float(obj)
+        if hasattr(obj, '__html__'):
+            return str(obj.__html__())
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self._default).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
-app.config['SESSION_TYPE'] = 'filesystem'
+
+REDIS_URL = os.getenv('REDIS_URL')
+PRICING_CACHE_TIMEOUT = 3600
+
+# Keep the cart server-side in Redis when available so cart mutations don't
+# re-serialize the whole cart into the session cookie on every request.
+# Without Redis, Flask's default signed-cookie session is used.
+if REDIS_URL:
+    app.config['SESSION_TYPE'] = 'redis'
+    app.config['SESSION_REDIS'] = redis.from_url(REDIS_URL)
+    app.config['SESSION_KEY_PREFIX'] = 'awspc_session:'
+    Session(app)
+
+# Pricing data is quasi-static, so identical lookups are served from cache.
+# Redis is used when REDIS_URL is set, otherwise an in-process cache.
+cache = Cache(app, config={
+    'CACHE_TYPE': 'RedisCache' if REDIS_URL else 'SimpleCache',
+    'CACHE_REDIS_URL': REDIS_URL,
+    'CACHE_DEFAULT_TIMEOUT': PRICING_CACHE_TIMEOUT,
+    'CACHE_KEY_PREFIX': 'awspc_'
+})
+
+# Pricing JSON is highly repetitive and compresses well. The CSV export is
+# streamed, so it is left uncompressed rather than buffered for compression.
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_BR_LEVEL'] = 5
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_STREAMS'] = False
+Compress(app)
+
+COMPRESS_ALGORITHMS = app.config['COMPRESS_ALGORITHM']
+
+# Pricing lookups fan out to the AWS Pricing API, which has its own quota, so
+# clients share one rate limit across all pricing endpoints. Counters live in
+# Redis when available so the moving window is shared across workers,
+# otherwise they are per-process.
+PRICING_RATE_LIMIT = os.getenv('PRICING_RATE_LIMIT', '30/minute')
+# A batch is charged at most the smallest window of the limit, so a valid
+# batch larger than that is still admitted when the window is fresh
+MAX_BATCH_COST = min(limit.amount for limit in parse_many(PRICING_RATE_LIMIT))
+
+# Flushing the cache forces cold pricing lookups, so it takes an admin token
+# sent as X-Admin-Token. Without ADMIN_TOKEN set the endpoint is disabled.
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+
+limiter = Limiter(
+    get_remote_address,
+    app=app,
+    storage_uri=REDIS_URL or 'memory://',
+    strategy='moving-window',
+    default_limits=[os.getenv('DEFAULT_RATE_LIMIT', '200/hour')]
+)
 
 # Initialize AWS Pricing client
 try:
     pricing_client = AWSPricingClient()
 except Exception as e:
-    print(f"Warning: Could not initialize AWS Pricing client: {e}")
+    logger.warning("Could not initialize AWS Pricing client: %s", e)
     pricing_client = None
 
 
+def _get_cart():
+    """Return the session cart, an insertion-ordered dict of item id -> item"""
+    cart = session.get('cart')
+    if not isinstance(cart, dict):
+        # Carts saved before the id-indexed layout are plain lists
+        cart = {item['id']: item for item in cart or []}
+        session['cart'] = cart
+        session.pop('cart_total', None)
+    return cart
+
+
+def _get_cart_total(cart):
+    """Return the running cart total, rebuilding it if the session lacks one"""
+    total = session.get('cart_total')
+    if total is None:
+        total = sum(item.get('monthlyCost', 0) for item in cart.values())
+        session['cart_total'] = total
+    return total
+
+
+def api_endpoint(require_pricing=False):
+    """Wrap an API view with the shared pricing-client check and JSON error response"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if require_pricing and not pricing_client:
+                return jsonify({'success': False, 'error': 'AWS Pricing client not initialized'}), 500
+            try:
+                return view(*args, **kwargs)
+            except Exception as e:
+                return jsonify({'success': False, 'error': str(e)}), 500
+        return wrapper
+    return decorator
+
+
 @app.route('/')
 def index():
     """Render the main page"""
     # Initialize cart in session if it doesn't exist
-    if 'cart' not in session:
-        session['cart'] = []
+    _get_cart()
     return render_template('index.html')
 
 
+# ==================== Cached Pricing Lookups ====================
+
+@cache.memoize(timeout=PRICING_CACHE_TIMEOUT)
+def _ec2_lookup(instance_type, region, operating_system, tenancy):
+    """Fetch and format EC2 pricing (memoized on the query parameters)"""
+    products = pricing_client.get_ec2_pricing(
+        instance_type=instance_type,
+        region=region,
+        operating_system=operating_system,
+        tenancy=tenancy
+    )
+    
+    # Bulk pricing client already returns formatted data
+    if pricing_client.use_bulk_pricing:
+        return products
+    return pricing_client.format_pricing_data(products)
+
+
+@cache.memoize(timeout=PRICING_CACHE_TIMEOUT)
+def _rds_lookup(instance_type, region, database_engine, deployment_option):
+    """Fetch and format RDS pricing (memoized on the query parameters)"""
+    products = pricing_client.get_rds_pricing(
+        instance_type=instance_type,
+        region=region,
+        database_engine=database_engine,
+        deployment_option=deployment_option
+    )
+    
+    # Bulk pricing client already returns formatted data
+    if pricing_client.use_bulk_pricing:
+        return products
+    return pricing_client.format_pricing_data(products)
+
+
+@cache.memoize(timeout=PRICING_CACHE_TIMEOUT)
+def _s3_lookup(storage_class, region, storage_gb):
+    """Fetch and format S3 pricing (memoized on the query parameters)"""
+    products = pricing_client.get_s3_pricing(storage_class=storage_class, region=region)
+    return pricing_client.format_s3_pricing_data(products, storage_gb)
+
+
+@cache.memoize(timeout=PRICING_CACHE_TIMEOUT)
+def _vpc_lookup(component, region, quantity):
+    """Fetch and format VPC pricing (memoized on the query parameters)"""
+    products = pricing_client.get_vpc_pricing(component=component, region=region)
+    return pricing_client.format_single_price(products, 'VPC', quantity)
+
+
+@cache.memoize(timeout=PRICING_CACHE_TIMEOUT)
+def _alb_lookup(region, quantity):
+    """Fetch and format ALB pricing (memoized on the query parameters)"""
+    products = pricing_client.get_alb_pricing(region=region)
+    return pricing_client.format_single_price(products, 'ALB', quantity)
+
+
+@cache.memoize(timeout=PRICING_CACHE_TIMEOUT)
+def _route53_lookup(component, quantity):
+    """Fetch and format Route53 pricing (memoized on the query parameters)"""
+    products = pricing_client.get_route53_pricing(component=component)
+    return pricing_client.format_single_price(products, 'Route53', quantity)
+
+
+# ==================== Pricing Queries ====================
+
+def _ec2_query(data):
+    """Resolve an EC2 pricing request body into a cached lookup"""
+    query = parse(EC2Query, data)
+    return _ec2_lookup(query.instance_type, query.region, query.operating_system, query.tenancy)
+
+
+def _rds_query(data):
+    """Resolve an RDS pricing request body into a cached lookup"""
+    query = parse(RDSQuery, data)
+    return _rds_lookup(query.instance_type, query.region, query.database_engine, query.deployment_option)
+
+
+def _s3_query(data):
+    """Resolve an S3 pricing request body into a cached lookup"""
+    query = parse(S3Query, data)
+    return _s3_lookup(query.storage_class, query.region, query.storage_gb)
+
+
+def _vpc_query(data):
+    """Resolve a VPC pricing request body into a cached lookup"""
+    query = parse(VPCQuery, data)
+    return _vpc_lookup(query.component, query.region, query.quantity)
+
+
+def _alb_query(data):
+    """Resolve an ALB pricing request body into a cached lookup"""
+    query = parse(ALBQuery, data)
+    return _alb_lookup(query.region, query.quantity)
+
+
+def _route53_query(data):
+    """Resolve a Route53 pricing request body into a cached lookup"""
+    query = parse(Route53Query, data)
+    return _route53_lookup(query.component, query.quantity)
+
+
+# Service name -> query resolver, shared by the single and batch endpoints
+PRICING_QUERIES = {
+    'ec2': _ec2_query,
+    'rds': _rds_query,
+    's3': _s3_query,
+    'vpc': _vpc_query,
+    'alb': _alb_query,
+    'route53': _route53_query
+}
+
+MAX_BATCH_QUERIES = 50
+
+
+def _batch_queries():
+    """The request's batch queries, or None unless the body is {"queries": [{...}, ...]}"""
+    body = request.get_json(silent=True)
+    queries = body.get('queries', []) if isinstance(body, dict) else None
+    if not isinstance(queries, list) or not all(isinstance(query, dict) for query in queries):
+        return None
+    return queries
+
+
+# ==================== Cache Prewarm ====================
+
+PREWARM_INSTANCE_TYPES = ['t2.micro', 't3.micro', 'm5.large']
+PREWARM_REGIONS = [
+    'US East (N. Virginia)',
+    'US West (Oregon)',
+    'EU (Ireland)',
+    'EU (Frankfurt)',
+    'Asia Pacific (Tokyo)'
+]
+
+
+def _prewarm_pricing_cache():
+    """Populate the pricing cache with the most common EC2 lookups"""
+    with app.app_context():
+        # The bulk EC2 endpoint skips _ec2_lookup and serves the bulk client's
+        # memoized JSON bytes, so those are what gets warmed in bulk mode.
+        # use_bulk_pricing runs the credential probe, which can raise
+        try:
+            if pricing_client.use_bulk_pricing:
+                warm = functools.partial(pricing_client.bulk_client.warmup().find_ec2_pricing_bytes, os='Linux')
+            else:
+                warm = functools.partial(_ec2_lookup, operating_system='Linux', tenancy='Shared')
+        except Exception as e:
+            logger.warning("Prewarm skipped: %s", e)
+            return
+        for region in PREWARM_REGIONS:
+            for instance_type in PREWARM_INSTANCE_TYPES:
+                try:
+                    warm(instance_type, region)
+                except Exception as e:
+                    logger.warning("Prewarm failed for %s in %s: %s", instance_type, region, e)
+
+
+def start_pricing_prewarm():
+    """
+    Warm the pricing cache in a background thread, so startup isn't blocked
+    on AWS round-trips.
+    
+    Called once per serving process: by the development server below and by
+    gunicorn's post_fork hook. Threads don't survive a fork, so starting it
+    at import would leave preloaded gunicorn workers unwarmed.
+    """
+    if pricing_client and os.getenv('PRICING_PREWARM', 'True').lower() == 'true':
+        threading.Thread(target=_prewarm_pricing_cache, name='pricing-prewarm', daemon=True).start()
+
+
 # ==================== Pricing Endpoints ====================
 
+def _batch_cost():
+    """Charge a batch request one rate-limit hit per query it contains"""
+    queries = _batch_queries()
+    if queries is None or len(queries) > MAX_BATCH_QUERIES:
+        # Rejected by the endpoint with a 400, so charged as a single request
+        return 1
+    return max(1, min(len(queries), MAX_BATCH_COST))
+
+
+def _encoded_data_response(data_json: bytes, count: int):
+    """Success response around already JSON-encoded data, matching jsonify's output"""
+    return Response(b'{"success":true,"data":%s,"count":%d}' % (data_json, count), mimetype='application/json')
+
+
 @app.route('/api/pricing/ec2', methods=['POST'])
+@limiter.shared_limit(PRICING_RATE_LIMIT, scope='pricing')
+@api_endpoint(require_pricing=True)
 def get_ec2_pricing():
     """Get EC2 pricing based on parameters"""
-    try:
-        if not pricing_client:
-            return jsonify({'success': False, 'error': 'AWS Pricing client not initialized'}), 500
-        
-        data = request.get_json()
-        products = pricing_client.get_ec2_pricing(
-            instance_type=data.get('instanceType', 't2.micro'),
-            region=data.get('region', 'US East (N. Virginia)'),
-            operating_system=data.get('operatingSystem', 'Linux'),
-            tenancy=data.get('tenancy', 'Shared')
-        )
-        
-        # Bulk pricing client already returns formatted data
-        if pricing_client.use_bulk_pricing:
-            formatted_data = products
-        else:
-            formatted_data = pricing_client.format_pricing_data(products)
-        
-        return jsonify({'success': True, 'data': formatted_data, 'count': len(formatted_data)})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    if pricing_client.use_bulk_pricing:
+        # Bulk lookups are memoized as encoded JSON, so repeat queries skip serialization
+        query = parse(EC2Query, request.get_json())
+        lookup = (query.instance_type, query.region, query.operating_system)
+        bulk = pricing_client.bulk_client
+        return _encoded_data_response(bulk.find_ec2_pricing_bytes(*lookup), len(bulk.find_ec2_pricing(*lookup)))
+    
+    formatted_data = _ec2_query(request.get_json())
+    
+    return jsonify({'success': True, 'data': formatted_data, 'count': len(formatted_data)})
 
 
 @app.route('/api/pricing/rds', methods=['POST'])
+@limiter.shared_limit(PRICING_RATE_LIMIT, scope='pricing')
+@api_endpoint(require_pricing=True)
 def get_rds_pricing():
     """Get RDS pricing based on parameters"""
-    try:
-        if not pricing_client:
-            return jsonify({'success': False, 'error': 'AWS Pricing client not initialized'}), 500
-        
-        data = request.get_json()
-        products = pricing_client.get_rds_pricing(
-            instance_type=data.get('instanceType', 'db.t3.micro'),
-            region=data.get('region', 'US East (N. Virginia)'),
-            database_engine=data.get('databaseEngine', 'MySQL'),
-            deployment_option=data.get('deploymentOption', 'Single-AZ')
-        )
-        
-        # Bulk pricing client already returns formatted data
-        if pricing_client.use_bulk_pricing:
-            formatted_data = products
-        else:
-            formatted_data = pricing_client.format_pricing_data(products)
-        
-        return jsonify({'success': True, 'data': formatted_data, 'count': len(formatted_data)})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    if pricing_client.use_bulk_pricing:
+        query = parse(RDSQuery, request.get_json())
+        lookup = (query.instance_type, query.region, query.database_engine, query.deployment_option)
+        bulk = pricing_client.bulk_client
+        return _encoded_data_response(bulk.find_rds_pricing_bytes(*lookup), len(bulk.find_rds_pricing(*lookup)))
+    
+    formatted_data = _rds_query(request.get_json())
+    
+    return jsonify({'success': True, 'data': formatted_data, 'count': len(formatted_data)})
 
 
 @app.route('/api/pricing/s3', methods=['POST'])
+@limiter.shared_limit(PRICING_RATE_LIMIT, scope='pricing')
+@api_endpoint(require_pricing=True)
 def get_s3_pricing():
     """Get S3 pricing based on parameters"""
-    try:
-        if not pricing_client:
-            return jsonify({'success': False, 'error': 'AWS Pricing client not initialized'}), 500
-        
-        data = request.get_json()
-        storage_gb = float(data.get('storageGB', 0))
-        
-        products = pricing_client.get_s3_pricing(
-            storage_class=data.get('storageClass', 'General Purpose'),
-            region=data.get('region', 'US East (N. Virginia)')
-        )
-        
-        formatted_data = pricing_client.format_s3_pricing_data(products, storage_gb)
-        return jsonify({'success': True, 'data': formatted_data, 'count': len(formatted_data)})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    formatted_data = _s3_query(request.get_json())
+    
+    return jsonify({'success': True, 'data': formatted_data, 'count': len(formatted_data)})
 
 
 @app.route('/api/pricing/vpc', methods=['POST'])
+@limiter.shared_limit(PRICING_RATE_LIMIT, scope='pricing')
+@api_endpoint(require_pricing=True)
 def get_vpc_pricing():
     """Get VPC pricing based on parameters"""
-    try:
-        if not pricing_client:
-            return jsonify({'success': False, 'error': 'AWS Pricing client not initialized'}), 500
-        
-        data = request.get_json()
-        quantity = int(data.get('quantity', 1))
-        
-        products = pricing_client.get_vpc_pricing(
-            component=data.get('component', 'NatGateway'),
-            region=data.get('region', 'US East (N. Virginia)')
-        )
-        
-        formatted_data = pricing_client.format_single_price(products, 'VPC', quantity)
-        return jsonify({'success': True, 'data': formatted_data, 'count': len(formatted_data)})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    formatted_data = _vpc_query(request.get_json())
+    
+    return jsonify({'success': True, 'data': formatted_data, 'count': len(formatted_data)})
 
 
 @app.route('/api/pricing/alb', methods=['POST'])
+@limiter.shared_limit(PRICING_RATE_LIMIT, scope='pricing')
+@api_endpoint(require_pricing=True)
 def get_alb_pricing():
     """Get ALB pricing based on parameters"""
-    try:
-        if not pricing_client:
-            return jsonify({'success': False, 'error': 'AWS Pricing client not initialized'}), 500
-        
-        data = request.get_json()
-        quantity = int(data.get('quantity', 1))
-        
-        products = pricing_client.get_alb_pricing(
-            region=data.get('region', 'US East (N. Virginia)')
-        )
-        
-        formatted_data = pricing_client.format_single_price(products, 'ALB', quantity)
-        return jsonify({'success': True, 'data': formatted_data, 'count': len(formatted_data)})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    formatted_data = _alb_query(request.get_json())
+    
+    return jsonify({'success': True, 'data': formatted_data, 'count': len(formatted_data)})
 
 
 @app.route('/api/pricing/route53', methods=['POST'])
+@limiter.shared_limit(PRICING_RATE_LIMIT, scope='pricing')
+@api_endpoint(require_pricing=True)
 def get_route53_pricing():
     """Get Route53 pricing based on parameters"""
-    try:
-        if not pricing_client:
-            return jsonify({'success': False, 'error': 'AWS Pricing client not initialized'}), 500
-        
-        data = request.get_json()
-        quantity = int(data.get('quantity', 1))
-        
-        products = pricing_client.get_route53_pricing(
-            component=data.get('component', 'HostedZone')
-        )
-        
-        formatted_data = pricing_client.format_single_price(products, 'Route53', quantity)
-        return jsonify({'success': True, 'data': formatted_data, 'count': len(formatted_data)})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    formatted_data = _route53_query(request.get_json())
+    
+    return jsonify({'success': True, 'data': formatted_data, 'count': len(formatted_data)})
+
+
+@app.route('/api/pricing/batch', methods=['POST'])
+@limiter.shared_limit(PRICING_RATE_LIMIT, scope='pricing', cost=_batch_cost)
+@api_endpoint(require_pricing=True)
+def get_batch_pricing():
+    """Resolve several pricing queries in a single round-trip"""
+    queries = _batch_queries()
+    if queries is None:
+        return jsonify({'success': False, 'error': 'Expected a JSON body of the form {"queries": [{...}, ...]}'}), 400
+    if len(queries) > MAX_BATCH_QUERIES:
+        return jsonify({'success': False, 'error': f'At most {MAX_BATCH_QUERIES} queries per batch'}), 400
+    
+    results = []
+    for query in queries:
+        resolver = PRICING_QUERIES.get(str(query.get('service', '')).lower())
+        if resolver is None:
+            results.append({'success': False, 'error': f"Unknown service: {query.get('service')}"})
+            continue
+        try:
+            formatted_data = resolver(query)
+            results.append({'success': True, 'data': formatted_data, 'count': len(formatted_data)})
+        except Exception as e:
+            results.append({'success': False, 'error': str(e)})
+    
+    return jsonify({'success': True, 'results': results, 'count': len(results)})
 
 
 # ==================== Cart Endpoints ====================
 
 @app.route('/api/cart/add', methods=['POST'])
+@api_endpoint()
 def add_to_cart():
     """Add item to cart"""
-    try:
-        data = request.get_json()
-        
-        if 'cart' not in session:
-            session['cart'] = []
-        
-        # Create cart item with unique ID
-        cart_item = {
-            'id': str(uuid.uuid4()),
-            'service': data.get('service'),
-            'resourceType': data.get('resourceType'),
-            'specifications': data.get('specifications'),
-            'region': data.get('region'),
-            'quantity': data.get('quantity', 1),
-            'hourlyCost': float(data.get('hourlyCost', 0)),
-            'monthlyCost': float(data.get('monthlyCost', 0))
-        }
-        
-        session['cart'].append(cart_item)
-        session.modified = True
-        
-        return jsonify({
-            'success': True,
-            'message': 'Item added to cart',
-            'cartCount': len(session['cart'])
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    item = parse(CartItemRequest, request.get_json())
+    cart = _get_cart()
+    
+    # Create cart item with unique ID
+    cart_item = item.to_cart_item(secrets.token_hex(16))
+    
+    session['cart_total'] = _get_cart_total(cart) + cart_item['monthlyCost']
+    cart[cart_item['id']] = cart_item
+    session.modified = True
+    
+    return jsonify({
+        'success': True,
+        'message': 'Item added to cart',
+        'cartCount': len(cart)
+    })
 
 
 @app.route('/api/cart/items', methods=['GET'])
+@api_endpoint()
 def get_cart_items():
     """Get all cart items"""
-    try:
-        if 'cart' not in session:
-            session['cart'] = []
-        
-        return jsonify({
-            'success': True,
-            'items': session['cart'],
-            'count': len(session['cart'])
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    cart = _get_cart()
+    
+    return jsonify({
+        'success': True,
+        'items': list(cart.values()),
+        'count': len(cart)
+    })
 
 
 @app.route('/api/cart/remove/<item_id>', methods=['DELETE'])
+@api_endpoint()
 def remove_from_cart(item_id):
     """Remove item from cart"""
-    try:
-        if 'cart' not in session:
-            session['cart'] = []
-        
-        session['cart'] = [item for item in session['cart'] if item['id'] != item_id]
-        session.modified = True
-        
-        return jsonify({
-            'success': True,
-            'message': 'Item removed from cart',
-            'cartCount': len(session['cart'])
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    cart = _get_cart()
+    
+    total = _get_cart_total(cart)
+    item = cart.pop(item_id, None)
+    if item is not None:
+        # Reset on empty so float drift can't accumulate across carts
+        session['cart_total'] = total - item.get('monthlyCost', 0) if cart else 0.0
+    session.modified = True
+    
+    return jsonify({
+        'success': True,
+        'message': 'Item removed from cart',
+        'cartCount': len(cart)
+    })
 
 
 @app.route('/api/cart/clear', methods=['DELETE'])
+@api_endpoint()
 def clear_cart():
     """Clear all items from cart"""
-    try:
-        session['cart'] = []
-        session.modified = True
-        
-        return jsonify({
-            'success': True,
-            'message': 'Cart cleared'
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    session['cart'] = {}
+    session['cart_total'] = 0.0
+    session.modified = True
+    
+    return jsonify({
+        'success': True,
+        'message': 'Cart cleared'
+    })
 
 
 @app.route('/api/cart/total', methods=['GET'])
+@api_endpoint()
 def get_cart_total():
     """Get total cost of cart items"""
-    try:
-        if 'cart' not in session:
-            session['cart'] = []
-        
-        total = sum(item.get('monthlyCost', 0) for item in session['cart'])
-        
-        return jsonify({
-            'success': True,
-            'total': round(total, 2),
-            'count': len(session['cart'])
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    cart = _get_cart()
+    if not cart:
+        return jsonify({'success': True, 'total': 0.0, 'count': 0})
+    
+    total = _get_cart_total(cart)
+    
+    return jsonify({
+        'success': True,
+        'total': round(total, 2),
+        'count': len(cart)
+    })
 
 
 # ==================== Export Endpoints ====================
 
 @app.route('/api/export/csv', methods=['GET'])
+@api_endpoint()
 def export_csv():
     """Export cart items as CSV"""
-    try:
-        if 'cart' not in session:
-            session['cart'] = []
-        
-        total = sum(item.get('monthlyCost', 0) for item in session['cart'])
-        csv_content = generate_csv_report(session['cart'], total)
-        
-        return Response(
-            csv_content,
-            mimetype='text/csv',
-            headers={'Content-Disposition': 'attachment; filename=aws_cost_estimate.csv'}
-        )
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    cart = _get_cart()
+    headers = {'Content-Disposition': 'attachment; filename=aws_cost_estimate.csv'}
+    if not cart:
+        return Response(empty_csv_report(), mimetype='text/csv', headers=headers)
+    
+    cart_items = list(cart.values())
+    total = _get_cart_total(cart)
+    
+    # Stream rows to the client as they are generated
+    return Response(
+        stream_with_context(iter_csv_report(cart_items, total)),
+        mimetype='text/csv',
+        headers=headers
+    )
 
 
 # ==================== Utility Endpoints ====================
@@ -315,33 +584,45 @@ def test_connection():
         return jsonify({'success': False, 'error': str(e)})
 
 
+@app.route('/api/cache/flush', methods=['POST'])
+@api_endpoint()
+def flush_cache():
+    """Invalidate all cached pricing lookups"""
+    supplied = request.headers.get('X-Admin-Token', '')
+    if not ADMIN_TOKEN or not secrets.compare_digest(supplied.encode(), ADMIN_TOKEN.encode()):
+        return jsonify({'success': False, 'error': 'Admin token required'}), 403
+    
+    # Also drops the results memoized by the _*_lookup functions
+    cache.clear()
+    if pricing_client:
+        # The client's TTL cache and the bulk client's per-process memos
+        pricing_client.invalidate_cache()
+    return jsonify({'success': True, 'message': 'Pricing cache flushed'})
+
+
 @app.route('/api/available-instances', methods=['GET'])
+@api_endpoint()
 def get_available_instances():
     """Get all available EC2 instance types for the current region"""
-    try:
-        region = request.args.get('region', 'US East (N. Virginia)')
+    region = request.args.get('region', 'US East (N. Virginia)')
+    
+    if pricing_client and pricing_client.use_bulk_pricing:
+        # Get instance types from bulk pricing data
+        instances = list(pricing_client.bulk_client.instance_types(region))
         
-        if pricing_client and pricing_client.use_bulk_pricing:
-            # Get instance types from bulk pricing data
-            ec2_data = pricing_client.bulk_client.pricing_data.get('EC2', {})
-            region_data = ec2_data.get(region, {})
-            instances = sorted(list(region_data.keys()))
-            
-            return jsonify({
-                'success': True,
-                'instances': instances,
-                'count': len(instances),
-                'region': region
-            })
-        else:
-            # Return a basic list if using AWS API
-            return jsonify({
-                'success': True,
-                'instances': ['t2.micro', 't3.micro', 'm5.large'],  # Basic fallback
-                'count': 3
-            })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return jsonify({
+            'success': True,
+            'instances': instances,
+            'count': len(instances),
+            'region': region
+        })
+    else:
+        # Return a basic list if using AWS API
+        return jsonify({
+            'success': True,
+            'instances': ['t2.micro', 't3.micro', 'm5.large'],  # Basic fallback
+            'count': 3
+        })
 
 
 @app.errorhandler(404)
@@ -350,21 +631,54 @@ def not_found(error):
     return jsonify({'success': False, 'error': 'Resource not found'}), 404
 
 
+@app.errorhandler(429)
+def rate_limited(error):
+    """Handle rate limit errors"""
+    return jsonify({'success': False, 'error': f'Rate limit exceeded: {error.description}'}), 429
+
+
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
     return jsonify({'success': False, 'error': 'Internal server error'}), 500
 
 
+# Cache-Control for ETag-tagged endpoints. The instance type list for a region
+# changes at most weekly, so browsers and CDNs may keep it for a day.
+ETAG_CACHE_CONTROL = {
+    '/api/pricing/': 'private, max-age=300',
+    '/api/available-instances': 'public, max-age=86400, stale-while-revalidate=604800'
+}
+
+
+@app.after_request
+def add_pricing_etag(response):
+    """Tag pricing responses with an ETag and answer matching If-None-Match with 304"""
+    cache_control = next(
+        (value for prefix, value in ETAG_CACHE_CONTROL.items() if request.path.startswith(prefix)),
+        None
+    )
+    if cache_control and response.status_code == 200:
+        response.add_etag()
+        response.headers['Cache-Control'] = cache_control
+
+        # Werkzeug's make_conditional() only handles GET/HEAD, pricing queries are POSTs
+        # Flask-Compress suffixes the tag with the encoding (e.g. "<etag>:gzip")
+        etag, _ = response.get_etag()
+        candidates = [etag] + [f'{etag}:{algorithm}' for algorithm in COMPRESS_ALGORITHMS]
+        if any(request.if_none_match.contains(candidate) for candidate in candidates):
+            response.status_code = 304
+            response.set_data(b'')
+    return response
+
+
+# Development server only; see the README for running under gunicorn or hypercorn
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
-    debug = os.getenv('FLASK_DEBUG', 'True') == 'True'
+    # The reloader and debugger slow every request, so they are opt-in
+    debug = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     
-    print(f"\n{'='*60}")
-    print("🚀 AWS Pricing Calculator")
-    print(f"{'='*60}")
-    print(f"Server running on http://localhost:{port}")
-    print(f"Debug mode: {debug}")
-    print(f"{'='*60}\n")
+    logger.info("AWS Pricing Calculator running on http://localhost:%d (debug=%s)", port, debug)
+    start_pricing_prewarm()
     
     app.run(host='0.0.0.0', port=port, debug=debug)
@@ -7,15 +7,265 @@ Supports both AWS API (with credentials) and public bulk pricing (no credentials
 """
 
 import boto3
+import functools
 import json
-from typing import Dict, List, Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError, NoCredentialsError
 import logging
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# boto3 clients are thread-safe, but the default pool of 10 connections makes
+# concurrent requests from threaded workers queue behind each other
+BOTO_CONFIG = Config(
+    max_pool_connections=int(os.getenv('AWS_MAX_POOL_CONNECTIONS', '32')),
+    retries={'max_attempts': 3, 'mode': 'standard'}
+)
+
+
+# TERM_MATCH filter templates for get_products: (field, fixed value), where a
+# None value is filled in per call from the lookup arguments
+_EC2_FILTER_TMPL = (
+    ('instanceType', None),
+    ('location', None),
+    ('operatingSystem', None),
+    ('tenancy', None),
+    ('preInstalledSw', 'NA'),
+    ('capacitystatus', 'Used')
+)
+_RDS_FILTER_TMPL = (
+    ('instanceType', None),
+    ('location', None),
+    ('databaseEngine', None),
+    ('deploymentOption', None)
+)
+_S3_FILTER_TMPL = (('location', None), ('storageClass', None), ('volumeType', 'Standard'))
+_ALB_FILTER_TMPL = (('location', None), ('productFamily', 'Load Balancer-Application'))
+
+# Component -> filter template; unknown components query without filters
+_VPC_COMPONENT_FILTERS = {
+    'NatGateway': (('location', None), ('productFamily', 'NAT Gateway')),
+    'VPN': (('location', None), ('productFamily', 'VPN Connection'))
+}
+_ROUTE53_COMPONENT_FILTERS = {
+    'HostedZone': (('productFamily', 'DNS Zone'),),
+    'Queries': (('productFamily', 'DNS Query'),)
+}
+
+
+def _term_filter_factory(template: tuple):
+    """
+    Compile a filter template into a builder taking its open fields positionally.
+    
+    Fixed entries are built once and shared between calls; only the open
+    fields are rendered per lookup.
+    """
+    entries = tuple(
+        (field, None if value is None else {'Type': 'TERM_MATCH', 'Field': field, 'Value': value})
+        for field, value in template
+    )
+    
+    def build(*values: str) -> List[Dict]:
+        open_values = iter(values)
+        return [
+            entry if entry is not None else {'Type': 'TERM_MATCH', 'Field': field, 'Value': next(open_values)}
+            for field, entry in entries
+        ]
+    
+    return build
+
+
+_ec2_filters = _term_filter_factory(_EC2_FILTER_TMPL)
+_rds_filters = _term_filter_factory(_RDS_FILTER_TMPL)
+_s3_filters = _term_filter_factory(_S3_FILTER_TMPL)
+_alb_filters = _term_filter_factory(_ALB_FILTER_TMPL)
+_vpc_filters = {component: _term_filter_factory(tmpl) for component, tmpl in _VPC_COMPONENT_FILTERS.items()}
+_route53_filters = {component: _term_filter_factory(tmpl) for component, tmpl in _ROUTE53_COMPONENT_FILTERS.items()}
+_no_filters = _term_filter_factory(())
+
+
+# Hours in a billing month (365 days / 12 months * 24 hours)
+HOURS_PER_MONTH = 730
+
+# Services whose bulk pricing products are already in the formatted shape
+_BULK_SINGLE_PRICE_SERVICES = frozenset(('VPC', 'ALB', 'Route53'))
+
+# Shared read-only default for missing nested sections of a product
+_EMPTY = {}
+
+
+def _price_dimensions(product: Dict):
+    """Yield the On-Demand price dimensions of an AWS API product"""
+    _get = dict.get
+    on_demand = _get(_get(product, 'terms') or _EMPTY, 'OnDemand') or _EMPTY
+    return (
+        dimension
+        for offer_term in on_demand.values()
+        for dimension in (_get(offer_term, 'priceDimensions') or _EMPTY).values()
+    )
+
+
+def _product_attributes(product: Dict) -> Dict:
+    """Return the attributes of an AWS API product"""
+    return dict.get(dict.get(product, 'product') or _EMPTY, 'attributes') or _EMPTY
+
+
+def _to_float(value) -> Optional[float]:
+    """Parse a price, or return None if it isn't numeric"""
+    # Builtin float() beats fastnumbers on these short decimal strings here
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _usd_price(dimension: Dict) -> Optional[float]:
+    """Parse a price dimension's USD rate, treating a missing rate as 0"""
+    return _to_float(dict.get(dict.get(dimension, 'pricePerUnit') or _EMPTY, 'USD', 0))
+
+
+def _project_on_demand(product: Dict) -> Dict:
+    """
+    Keep only what the formatters read from an AWS API product.
+    
+    Raw products also carry Reserved terms, rate codes and SKUs, often the bulk
+    of each entry; projecting right after parsing drops them before the next
+    entry is decoded.
+    """
+    _get = dict.get
+    on_demand = _get(_get(product, 'terms') or _EMPTY, 'OnDemand') or _EMPTY
+    return {
+        'product': {'attributes': _product_attributes(product)},
+        'terms': {'OnDemand': {
+            term_code: {'priceDimensions': {
+                rate_code: {
+                    'pricePerUnit': _get(dimension, 'pricePerUnit') or _EMPTY,
+                    'unit': _get(dimension, 'unit', 'N/A'),
+                    'description': _get(dimension, 'description', 'N/A')
+                }
+                for rate_code, dimension in (_get(offer_term, 'priceDimensions') or _EMPTY).items()
+            }}
+            for term_code, offer_term in on_demand.items()
+        }}
+    }
+
+
+@dataclass(slots=True)
+class PricingInfo:
+    """Formatted pricing for one EC2 or RDS instance product"""
+    description: str = 'N/A'
+    location: str = 'N/A'
+    instanceType: str = 'N/A'
+    vcpu: str = 'N/A'
+    memory: str = 'N/A'
+    storage: str = 'N/A'
+    networkPerformance: str = 'N/A'
+    prices: List[Dict] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict:
+        """JSON-ready dict with the fields in declaration order"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _format_one_product(product: Dict) -> Optional[PricingInfo]:
+    """Format one AWS API product for format_pricing_data, or None if it can't be parsed"""
+    if not isinstance(product, dict):
+        return None
+    _get = dict.get
+    
+    # Extract product attributes
+    attrs = _product_attributes(product)
+    instance_type = _get(attrs, 'instanceType', 'N/A')
+    
+    # Extract price per hour from the On-Demand terms
+    prices = [
+        {
+            'amount': _get(_get(dimension, 'pricePerUnit') or _EMPTY, 'USD', 'N/A'),
+            'unit': _get(dimension, 'unit', 'N/A'),
+            'description': _get(dimension, 'description', 'N/A')
+        }
+        for dimension in _price_dimensions(product)
+    ]
+    
+    return PricingInfo(
+        description=instance_type,
+        location=_get(attrs, 'location', 'N/A'),
+        instanceType=instance_type,
+        vcpu=_get(attrs, 'vcpu', 'N/A'),
+        memory=_get(attrs, 'memory', 'N/A'),
+        storage=_get(attrs, 'storage', 'N/A'),
+        networkPerformance=_get(attrs, 'networkPerformance', 'N/A'),
+        prices=prices
+    )
+
+
+# Seconds a pricing lookup is reused before hitting the API again. Lookups
+# that found nothing are kept for less time so fixed-up catalog data shows up
+CACHE_TTL = 3600
+NEGATIVE_CACHE_TTL = 60
+
+
+class _TTLCache:
+    """Thread-safe dict of key -> value that expires entries after a TTL"""
+    
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return (hit, value) for key, dropping the entry if it has expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False, None
+            return True, value
+    
+    def set(self, key, value, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _cache_key(name: str, args: tuple, kwargs: Dict) -> tuple:
+    return (name, args, tuple(sorted(kwargs.items())))
+
+
+def _cached(ttl: float = CACHE_TTL, negative_ttl: float = NEGATIVE_CACHE_TTL):
+    """Memoize a client method on its arguments for ttl seconds (negative_ttl if empty)"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = _cache_key(method.__name__, args, kwargs)
+            hit, value = self._cache.get(key)
+            if hit:
+                return value
+            value = method(self, *args, **kwargs)
+            self._cache.set(key, value, ttl if value else negative_ttl)
+            return value
+        return wrapper
+    return decorator
+
 
 class AWSPricingClient:
     """Client for interacting with AWS Pricing API with bulk pricing fallback"""
@@ -28,27 +278,83 @@ class AWSPricingClient:
             region_name: AWS region (Pricing API is accessed via us-east-1)
             use_bulk_fallback: If True, fall back to bulk pricing when credentials unavailable
         """
-        self.use_bulk_pricing = False
+        self._use_bulk_pricing = False
+        self._use_bulk_fallback = use_bulk_fallback
         self.bulk_client = None
+        self._cache = _TTLCache()
+        # Attribute names per service code; these almost never change
+        self._attr_cache = {}
+        
+        # Credentials are verified on first use rather than here, so building
+        # the client doesn't cost an API round-trip
+        self._credentials_checked = False
+        self._credentials_error = None
+        self._credentials_lock = threading.Lock()
+        
+        # Per-service lookups share one fixed query shape
+        lookup = functools.partial(functools.partial, self.get_products, max_results=10, on_demand_only=True)
+        self._fetch_ec2 = lookup('AmazonEC2')
+        self._fetch_rds = lookup('AmazonRDS')
+        self._fetch_s3 = lookup('AmazonS3')
+        self._fetch_vpc = lookup('AmazonVPC')
+        self._fetch_alb = lookup('AWSELB')
+        self._fetch_route53 = lookup('AmazonRoute53')
+        
+        try:
+            self.client = boto3.client('pricing', region_name=region_name, config=BOTO_CONFIG)
+        except Exception as e:
+            raise Exception(f"Failed to initialize AWS Pricing client: {str(e)}")
+    
+    @property
+    def use_bulk_pricing(self) -> bool:
+        """True when serving public bulk pricing instead of the Pricing API"""
+        self._ensure_credentials()
+        return self._use_bulk_pricing
+    
+    def _ensure_credentials(self):
+        """
+        Probe the Pricing API once, switching to bulk pricing if credentials don't work.
         
+        Any other failure (network errors, throttling) is remembered and
+        re-raised on later calls without probing again.
+        """
+        if not self._credentials_checked:
+            with self._credentials_lock:
+                if not self._credentials_checked:
+                    try:
+                        self._probe_credentials()
+                    except Exception as e:
+                        self._credentials_error = e
+                    finally:
+                        self._credentials_checked = True
+        if self._credentials_error is not None:
+            raise self._credentials_error
+    
+    def _probe_credentials(self):
+        """Call the Pricing API once, falling back to bulk pricing on a credential error"""
         try:
-            self.client = boto3.client('pricing', region_name=region_name)
-            # Test if credentials work
             self.client.describe_services(MaxResults=1)
             logger.info("✅ AWS Pricing API initialized with credentials")
         except (NoCredentialsError, ClientError) as e:
-            if use_bulk_fallback:
-                logger.warning("⚠️  No AWS credentials found, using public bulk pricing")
-                from bulk_pricing import get_bulk_pricing_client
-                self.bulk_client = get_bulk_pricing_client()
-                self.use_bulk_pricing = True
-                self.client = None
-            else:
+            if not self._use_bulk_fallback:
                 raise Exception(f"Failed to initialize AWS Pricing client: {str(e)}")
+            logger.warning("⚠️  No AWS credentials found, using public bulk pricing")
+            from bulk_pricing import get_bulk_pricing_client
+            self.bulk_client = get_bulk_pricing_client()
+            self._use_bulk_pricing = True
+            self.client = None
         except Exception as e:
             raise Exception(f"Failed to initialize AWS Pricing client: {str(e)}")
 
     
+    def invalidate_cache(self):
+        """Drop all memoized pricing lookups"""
+        self._cache.clear()
+        self._attr_cache.clear()
+        if self.bulk_client is not None:
+            self.bulk_client.clear_lookups()
+    
+    @_cached()
     def get_services(self) -> List[str]:
         """
         Get a list of available AWS services.
@@ -56,10 +362,15 @@ class AWSPricingClient:
         Returns:
             List of service codes
         """
+        self._ensure_credentials()
         try:
-            response = self.client.describe_services(MaxResults=100)
-            services = [service['ServiceCode'] for service in response.get('Services', [])]
-            return sorted(services)
+            # Paginate so the list isn't truncated at one page of service codes
+            paginator = self.client.get_paginator('describe_services')
+            return sorted({
+                service['ServiceCode']
+                for page in paginator.paginate()
+                for service in page.get('Services', [])
+            })
         except (ClientError, BotoCoreError) as e:
             raise Exception(f"Error fetching services: {str(e)}")
     
@@ -73,6 +384,10 @@ class AWSPricingClient:
         Returns:
             List of attribute names and values
         """
+        if service_code in self._attr_cache:
+            return self._attr_cache[service_code]
+        
+        self._ensure_credentials()
         try:
             response = self.client.describe_services(
                 ServiceCode=service_code,
@@ -83,11 +398,13 @@ class AWSPricingClient:
                 return []
             
             attributes = response['Services'][0].get('AttributeNames', [])
+            self._attr_cache[service_code] = attributes
             return attributes
         except (ClientError, BotoCoreError) as e:
             raise Exception(f"Error fetching service attributes: {str(e)}")
     
-    def get_products(self, service_code: str, filters: Optional[List[Dict]] = None, max_results: int = 100) -> List[Dict]:
+    def get_products(self, service_code: str, filters: Optional[List[Dict]] = None, max_results: int = 100,
+                     on_demand_only: bool = False) -> List[Dict]:
         """
         Get products and pricing for a specific service.
         
@@ -95,31 +412,56 @@ class AWSPricingClient:
             service_code: AWS service code (e.g., 'AmazonEC2')
             filters: List of filter dictionaries with Type, Field, and Value
             max_results: Maximum number of results to return
+            on_demand_only: Keep only attributes and On-Demand price dimensions
             
         Returns:
             List of product pricing information
         """
-        try:
-            params = {
-                'ServiceCode': service_code,
-                'MaxResults': max_results
-            }
-            
-            if filters:
-                params['Filters'] = filters
-            
-            response = self.client.get_products(**params)
-            
-            products = []
-            for price_item in response.get('PriceList', []):
-                # Parse the JSON string
-                product_data = json.loads(price_item)
-                products.append(product_data)
+        return list(self.iter_products(service_code, filters, max_results, on_demand_only))
+    
+    def iter_products(self, service_code: str, filters: Optional[List[Dict]] = None,
+                      max_results: int = 100, on_demand_only: bool = False) -> Iterator[Dict]:
+        """
+        Stream products for a service, following pagination up to max_results.
+        
+        Each PriceList entry is parsed as its page arrives, so callers that
+        consume incrementally don't hold every raw page at once.
+        
+        Args:
+            service_code: AWS service code (e.g., 'AmazonEC2')
+            filters: List of filter dictionaries with Type, Field, and Value
+            max_results: Maximum number of products to yield
+            on_demand_only: Keep only attributes and On-Demand price dimensions
             
-            return products
-        except (ClientError, BotoCoreError) as e:
+        Yields:
+            Parsed product pricing information
+        """
+        self._ensure_credentials()
+        params = {
+            'ServiceCode': service_code,
+            'PaginationConfig': {'MaxItems': max_results, 'PageSize': min(max_results, 100)}
+        }
+        
+        if filters:
+            params['Filters'] = filters
+        
+        try:
+            for page in self.client.get_paginator('get_products').paginate(**params):
+                # Each PriceList entry is a JSON-encoded string
+                for price_item in page.get('PriceList', []):
+                    product = _loads(price_item)
+                    yield _project_on_demand(product) if on_demand_only else product
+        except ClientError as e:
+            # Filters the catalog rejects (e.g. a mistyped region) simply match
+            # nothing, so the empty result can be negatively cached
+            if e.response.get('Error', {}).get('Code') == 'ValidationException':
+                logger.warning("Pricing query rejected for %s: %s", service_code, e)
+                return
+            raise Exception(f"Error fetching products: {str(e)}")
+        except BotoCoreError as e:
             raise Exception(f"Error fetching products: {str(e)}")
     
+    @_cached()
     def get_ec2_pricing(self, instance_type: str = 't2.micro', region: str = 'US East (N. Virginia)', 
                         operating_system: str = 'Linux', tenancy: str = 'Shared') -> List[Dict]:
         """
@@ -139,17 +481,9 @@ class AWSPricingClient:
             return self.bulk_client.find_ec2_pricing(instance_type, region, operating_system)
         
         # Use AWS API
-        filters = [
-            {'Type': 'TERM_MATCH', 'Field': 'instanceType', 'Value': instance_type},
-            {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': region},
-            {'Type': 'TERM_MATCH', 'Field': 'operatingSystem', 'Value': operating_system},
-            {'Type': 'TERM_MATCH', 'Field': 'tenancy', 'Value': tenancy},
-            {'Type': 'TERM_MATCH', 'Field': 'preInstalledSw', 'Value': 'NA'},
-            {'Type': 'TERM_MATCH', 'Field': 'capacitystatus', 'Value': 'Used'}
-        ]
-        
-        return self.get_products('AmazonEC2', filters, max_results=10)
+        return self._fetch_ec2(_ec2_filters(instance_type, region, operating_system, tenancy))
     
+    @_cached()
     def get_rds_pricing(self, instance_type: str = 'db.t3.micro', region: str = 'US East (N. Virginia)',
                         database_engine: str = 'MySQL', deployment_option: str = 'Single-AZ') -> List[Dict]:
         """
@@ -169,14 +503,52 @@ class AWSPricingClient:
             return self.bulk_client.find_rds_pricing(instance_type, region, database_engine, deployment_option)
         
         # Use AWS API
-        filters = [
-            {'Type': 'TERM_MATCH', 'Field': 'instanceType', 'Value': instance_type},
-            {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': region},
-            {'Type': 'TERM_MATCH', 'Field': 'databaseEngine', 'Value': database_engine},
-            {'Type': 'TERM_MATCH', 'Field': 'deploymentOption', 'Value': deployment_option}
-        ]
+        return self._fetch_rds(_rds_filters(instance_type, region, database_engine, deployment_option))
+    
+    def get_multi_pricing(self, requests: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Run several pricing lookups concurrently.
+        
+        Args:
+            requests: Lookups as {'kind': 'ec2'|'rds'|'s3'|'vpc'|'alb'|'route53',
+                      'params': {...keyword arguments...}, 'label': optional key}
+            
+        Returns:
+            Dict of label (defaults to the kind) -> raw pricing products
+        """
+        getters = {
+            'ec2': self.get_ec2_pricing,
+            'rds': self.get_rds_pricing,
+            's3': self.get_s3_pricing,
+            'vpc': self.get_vpc_pricing,
+            'alb': self.get_alb_pricing,
+            'route53': self.get_route53_pricing
+        }
+        
+        results = {}
+        pending = []
+        for req in requests:
+            kind = req['kind']
+            if kind not in getters:
+                raise ValueError(f"Unknown pricing kind: {kind}")
+            label = req.get('label', kind)
+            params = req.get('params', {})
+            
+            # Serve cached lookups without going through the executor
+            hit, value = self._cache.get(_cache_key(getters[kind].__name__, (), params))
+            if hit:
+                results[label] = value
+            else:
+                pending.append((label, getters[kind], params))
+        
+        if pending:
+            # boto3 releases the GIL on network I/O, so API calls overlap
+            with ThreadPoolExecutor(max_workers=min(16, len(pending))) as executor:
+                futures = [(label, executor.submit(getter, **params)) for label, getter, params in pending]
+                for label, future in futures:
+                    results[label] = future.result()
         
-        return self.get_products('AmazonRDS', filters, max_results=10)
+        return results
     
     def format_pricing_data(self, products: List[Dict]) -> List[Dict]:
         """
@@ -188,48 +560,12 @@ class AWSPricingClient:
         Returns:
             List of formatted pricing information
         """
-        formatted_results = []
-        
-        for product in products:
-            try:
-                # Extract product attributes
-                product_attrs = product.get('product', {}).get('attributes', {})
-                
-                # Extract pricing terms (On-Demand)
-                terms = product.get('terms', {})
-                on_demand = terms.get('OnDemand', {})
-                
-                pricing_info = {
-                    'description': product_attrs.get('instanceType', 'N/A'),
-                    'location': product_attrs.get('location', 'N/A'),
-                    'instanceType': product_attrs.get('instanceType', 'N/A'),
-                    'vcpu': product_attrs.get('vcpu', 'N/A'),
-                    'memory': product_attrs.get('memory', 'N/A'),
-                    'storage': product_attrs.get('storage', 'N/A'),
-                    'networkPerformance': product_attrs.get('networkPerformance', 'N/A'),
-                    'prices': []
-                }
-                
-                # Extract price per hour
-                for offer_term in on_demand.values():
-                    for price_dimension in offer_term.get('priceDimensions', {}).values():
-                        price_per_unit = price_dimension.get('pricePerUnit', {}).get('USD', 'N/A')
-                        unit = price_dimension.get('unit', 'N/A')
-                        description = price_dimension.get('description', 'N/A')
-                        
-                        pricing_info['prices'].append({
-                            'amount': price_per_unit,
-                            'unit': unit,
-                            'description': description
-                        })
-                
-                formatted_results.append(pricing_info)
-            except Exception as e:
-                # Skip products that can't be parsed
-                continue
+        formatted = map(_format_one_product, products)
         
-        return formatted_results
+        # Skip products that can't be parsed; callers serialize dicts
+        return [result.to_dict() for result in formatted if result is not None]
 
+    @_cached()
     def get_s3_pricing(self, storage_class: str = 'General Purpose', region: str = 'US East (N. Virginia)') -> List[Dict]:
         """
         Get S3 storage pricing.
@@ -246,14 +582,9 @@ class AWSPricingClient:
             # Return basic structure, will be formatted with storage_gb in format_s3_pricing_data
             return self.bulk_client.find_s3_pricing(storage_class, region, 0)
         
-        filters = [
-            {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': region},
-            {'Type': 'TERM_MATCH', 'Field': 'storageClass', 'Value': storage_class},
-            {'Type': 'TERM_MATCH', 'Field': 'volumeType', 'Value': 'Standard'}
-        ]
-        
-        return self.get_products('AmazonS3', filters, max_results=10)
+        return self._fetch_s3(_s3_filters(region, storage_class))
     
+    @_cached()
     def get_vpc_pricing(self, component: str = 'NatGateway', region: str = 'US East (N. Virginia)') -> List[Dict]:
         """
         Get VPC component pricing.
@@ -269,23 +600,9 @@ class AWSPricingClient:
         if self.use_bulk_pricing:
             return self.bulk_client.find_vpc_pricing(component, region, 1)
         
-        # VPC NAT Gateway pricing
-        if component == 'NatGateway':
-            filters = [
-                {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': region},
-                {'Type': 'TERM_MATCH', 'Field': 'productFamily', 'Value': 'NAT Gateway'}
-            ]
-        # VPN Connection pricing
-        elif component == 'VPN':
-            filters = [
-                {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': region},
-                {'Type': 'TERM_MATCH', 'Field': 'productFamily', 'Value': 'VPN Connection'}
-            ]
-        else:
-            filters = []
-        
-        return self.get_products('AmazonVPC', filters, max_results=10)
+        return self._fetch_vpc(_vpc_filters.get(component, _no_filters)(region))
     
+    @_cached()
     def get_alb_pricing(self, region: str = 'US East (N. Virginia)') -> List[Dict]:
         """
         Get Application Load Balancer pricing.
@@ -300,13 +617,9 @@ class AWSPricingClient:
         if self.use_bulk_pricing:
             return self.bulk_client.find_alb_pricing(region, 1)
         
-        filters = [
-            {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': region},
-            {'Type': 'TERM_MATCH', 'Field': 'productFamily', 'Value': 'Load Balancer-Application'}
-        ]
-        
-        return self.get_products('AWSELB', filters, max_results=10)
+        return self._fetch_alb(_alb_filters(region))
     
+    @_cached()
     def get_route53_pricing(self, component: str = 'HostedZone') -> List[Dict]:
         """
         Get Route53 pricing.
@@ -321,18 +634,7 @@ class AWSPricingClient:
         if self.use_bulk_pricing:
             return self.bulk_client.find_route53_pricing(component, 1)
         
-        if component == 'HostedZone':
-            filters = [
-                {'Type': 'TERM_MATCH', 'Field': 'productFamily', 'Value': 'DNS Zone'}
-            ]
-        elif component == 'Queries':
-            filters = [
-                {'Type': 'TERM_MATCH', 'Field': 'productFamily', 'Value': 'DNS Query'}
-            ]
-        else:
-            filters = []
-        
-        return self.get_products('AmazonRoute53', filters, max_results=10)
+        return self._fetch_route53(_route53_filters.get(component, _no_filters)())
     
     def format_s3_pricing_data(self, products: List[Dict], storage_gb: float = 0) -> List[Dict]:
         """
@@ -349,50 +651,49 @@ class AWSPricingClient:
             return []
         
         formatted_results = []
+        _get = dict.get
         
         for product in products:
-            try:
-                # Check if this is bulk pricing format (has 'service' field)
-                if product.get('service') == 'S3':
-                    # Bulk pricing format - just update the storage GB and monthly cost
-                    if product.get('prices') and len(product['prices']) > 0:
-                        price_per_gb = float(product['prices'][0]['amount'])
-                        product['storageGB'] = storage_gb
-                        product['prices'][0]['monthly_cost'] = price_per_gb * storage_gb
-                    formatted_results.append(product)
-                    continue
-                
-                # AWS API format
-                product_attrs = product.get('product', {}).get('attributes', {})
-                terms = product.get('terms', {})
-                on_demand = terms.get('OnDemand', {})
-                
-                pricing_info = {
+            # Skip products that can't be parsed
+            if not isinstance(product, dict):
+                continue
+            
+            # Check if this is bulk pricing format (has 'service' field)
+            if _get(product, 'service') == 'S3':
+                # Bulk pricing format - just update the storage GB and monthly cost.
+                # Lookups are cached, so update copies rather than the shared product
+                prices = _get(product, 'prices')
+                if prices:
+                    price_per_gb = _to_float(_get(prices[0], 'amount'))
+                    if price_per_gb is None:
+                        continue
+                    price = {**prices[0], 'monthly_cost': price_per_gb * storage_gb}
+                    product = {**product, 'storageGB': storage_gb, 'prices': [price] + prices[1:]}
+                formatted_results.append(product)
+                continue
+            
+            # AWS API format
+            attrs = _product_attributes(product)
+            prices = []
+            for dimension in _price_dimensions(product):
+                price_per_unit = _usd_price(dimension)
+                if price_per_unit is None:
+                    break
+                prices.append({
+                    'amount': price_per_unit,
+                    # Calculate monthly cost based on storage size
+                    'monthly_cost': price_per_unit * storage_gb if storage_gb > 0 else 0,
+                    'unit': _get(dimension, 'unit', 'N/A')
+                })
+            else:
+                formatted_results.append({
                     'service': 'S3',
-                    'storageClass': product_attrs.get('storageClass', 'N/A'),
-                    'location': product_attrs.get('location', 'N/A'),
-                    'volumeType': product_attrs.get('volumeType', 'N/A'),
+                    'storageClass': _get(attrs, 'storageClass', 'N/A'),
+                    'location': _get(attrs, 'location', 'N/A'),
+                    'volumeType': _get(attrs, 'volumeType', 'N/A'),
                     'storageGB': storage_gb,
-                    'prices': []
-                }
-                
-                for offer_term in on_demand.values():
-                    for price_dimension in offer_term.get('priceDimensions', {}).values():
-                        price_per_unit = float(price_dimension.get('pricePerUnit', {}).get('USD', 0))
-                        unit = price_dimension.get('unit', 'N/A')
-                        
-                        # Calculate monthly cost based on storage size
-                        monthly_cost = price_per_unit * storage_gb if storage_gb > 0 else 0
-                        
-                        pricing_info['prices'].append({
-                            'amount': price_per_unit,
-                            'monthly_cost': monthly_cost,
-                            'unit': unit
-                        })
-                
-                formatted_results.append(pricing_info)
-            except Exception:
-                continue
+                    'prices': prices
+                })
         
         return formatted_results
     
@@ -412,61 +713,62 @@ class AWSPricingClient:
             return []
         
         formatted_results = []
+        _get = dict.get
+        
+        # Per-unit -> monthly multipliers, worked out once for every dimension
+        hourly_multiplier = HOURS_PER_MONTH * quantity
+        unit_multiplier = quantity
         
         for product in products:
-            try:
-                # Check if this is already bulk pricing format
-                if product.get('service') in ['VPC', 'ALB', 'Route53']:
-                    # Already formatted by bulk pricing, just update quantity if needed
-                    if product.get('prices') and len(product['prices']) > 0:
-                        # Recalculate monthly_cost with actual quantity
-                        amount = float(product['prices'][0].get('amount', 0))
-                        unit = product['prices'][0].get('unit', 'Hrs')
-                        if 'Hrs' in unit:
-                            product['prices'][0]['monthly_cost'] = amount * 730 * quantity
-                        else:
-                            product['prices'][0]['monthly_cost'] = amount * quantity
-                        product['quantity'] = quantity
-                    formatted_results.append(product)
-                    continue
-                
-                # AWS API format
-                product_attrs = product.get('product', {}).get('attributes', {})
-                terms = product.get('terms', {})
-                on_demand = terms.get('OnDemand', {})
+            # Skip products that can't be parsed
+            if not isinstance(product, dict):
+                continue
+            
+            # Check if this is already bulk pricing format
+            if _get(product, 'service') in _BULK_SINGLE_PRICE_SERVICES:
+                # Already formatted by bulk pricing, just update quantity if needed
+                prices = _get(product, 'prices')
+                if prices:
+                    # Recalculate monthly_cost with actual quantity, on copies
+                    # since lookups are cached
+                    amount = _to_float(_get(prices[0], 'amount', 0))
+                    if amount is None:
+                        continue
+                    unit = _get(prices[0], 'unit', 'Hrs')
+                    price = {
+                        **prices[0],
+                        'monthly_cost': amount * (hourly_multiplier if 'Hrs' in unit else unit_multiplier)
+                    }
+                    product = {**product, 'quantity': quantity, 'prices': [price] + prices[1:]}
+                formatted_results.append(product)
+                continue
+            
+            # AWS API format
+            attrs = _product_attributes(product)
+            prices = []
+            for dimension in _price_dimensions(product):
+                price_per_unit = _usd_price(dimension)
+                if price_per_unit is None:
+                    break
+                unit = _get(dimension, 'unit', 'N/A')
                 
-                pricing_info = {
+                # Calculate total cost based on quantity
+                # If unit is 'Hrs', calculate monthly (730 hours)
+                prices.append({
+                    'amount': price_per_unit,
+                    'monthly_cost': price_per_unit * (hourly_multiplier if 'Hrs' in unit else unit_multiplier),
+                    'unit': unit,
+                    'description': _get(dimension, 'description', 'N/A')
+                })
+            else:
+                formatted_results.append({
                     'service': service_name,
-                    'description': product_attrs.get('usagetype', 'N/A'),
-                    'location': product_attrs.get('location', 'N/A'),
-                    'productFamily': product_attrs.get('productFamily', 'N/A'),
+                    'description': _get(attrs, 'usagetype', 'N/A'),
+                    'location': _get(attrs, 'location', 'N/A'),
+                    'productFamily': _get(attrs, 'productFamily', 'N/A'),
                     'quantity': quantity,
-                    'prices': []
-                }
-                
-                for offer_term in on_demand.values():
-                    for price_dimension in offer_term.get('priceDimensions', {}).values():
-                        price_per_unit = float(price_dimension.get('pricePerUnit', {}).get('USD', 0))
-                        unit = price_dimension.get('unit', 'N/A')
-                        description = price_dimension.get('description', 'N/A')
-                        
-                        # Calculate total cost based on quantity
-                        # If unit is 'Hrs', calculate monthly (730 hours)
-                        if 'Hrs' in unit:
-                            monthly_cost = price_per_unit * 730 * quantity
-                        else:
-                            monthly_cost = price_per_unit * quantity
-                        
-                        pricing_info['prices'].append({
-                            'amount': price_per_unit,
-                            'monthly_cost': monthly_cost,
-                            'unit': unit,
-                            'description': description
-                        })
-                
-                formatted_results.append(pricing_info)
-            except Exception:
-                continue
+                    'prices': prices
+                })
         
         return formatted_results
 
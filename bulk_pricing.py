@@ -5,32 +5,62 @@ Scrapes current pricing from AWS official pages on app startup.
 Fetches ALL EC2 instance types and other service pricing.
 """
 
+import functools
+import gzip
+import hashlib
 import json
+import math
+import mmap
 import os
-import requests
-from bs4 import BeautifulSoup
+import sys
+import threading
+from array import array
+import dataclasses
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 import logging
 import re
 
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _json_default(obj):
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        if dataclasses.is_dataclass(obj):
+            return dataclasses.asdict(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), default=_json_default).encode()
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Cache settings
 CACHE_DIR = os.path.join(os.path.dirname(__file__), 'pricing_cache')
-CACHE_FILE = os.path.join(CACHE_DIR, 'scraped_pricing.json')
+CACHE_FILE = os.path.join(CACHE_DIR, 'scraped_pricing.json.gz')
+CACHE_ETAG_FILE = os.path.join(CACHE_DIR, 'scraped_pricing.etag')
+# Dense RDS price table as raw doubles, plus a JSON index of its axes
+CACHE_TABLES_FILE = os.path.join(CACHE_DIR, 'price_tables.bin')
+CACHE_TABLES_INDEX_FILE = os.path.join(CACHE_DIR, 'price_tables.json')
+PRICE_ITEMSIZE = array('d').itemsize
 
 # AWS Pricing Service API (no auth required)
 PRICING_API_BASE = "https://pricing.us-east-1.amazonaws.com"
 
-# Import comprehensive pricing data
-from comprehensive_pricing import EC2_PRICING
-
-# Comprehensive fallback pricing (official AWS pricing as of Jan 2026)
+# Comprehensive fallback pricing (official AWS pricing as of Jan 2026). The
+# regional RDS/S3/VPC/ALB tables are generated by fallback_pricing(); EC2
+# prices are served from comprehensive_pricing's dense tables, so the EC2
+# table stays empty
 FALLBACK_PRICING = {
-    "EC2": EC2_PRICING,
+    "EC2": {},
     "RDS": {},
     "S3": {},
     "VPC": {},
@@ -96,80 +126,320 @@ RDS_BASE_US_EAST = {
     },
 }
 
-# Import region multipliers from comprehensive_pricing
-from comprehensive_pricing import REGION_MULTIPLIERS
-
-# Generate pricing for all regions for RDS
-for region, multiplier in REGION_MULTIPLIERS.items():
-    FALLBACK_PRICING["RDS"][region] = {}
-    for instance_type, engine_data in RDS_BASE_US_EAST.items():
-        FALLBACK_PRICING["RDS"][region][instance_type] = {}
-        # Add all supported database engines
-        for engine, deployment_prices in engine_data.items():
-            FALLBACK_PRICING["RDS"][region][instance_type][engine] = {
-                "Single-AZ": round(deployment_prices["Single-AZ"] * multiplier, 4),
-                "Multi-AZ": round(deployment_prices["Multi-AZ"] * multiplier, 4)
-            }
+# Import region multipliers and the dense EC2 price lookup from comprehensive_pricing
+import comprehensive_pricing
+from comprehensive_pricing import (
+    BASE_REGION, REGION_MULTIPLIERS, get_price as get_ec2_price, instance_count as ec2_instance_count,
+    instance_types as ec2_instance_types
+)
 
-# Generate S3 pricing for all regions  
-S3_BASE = {"General Purpose": 0.023, "Infrequent Access": 0.0125, "Archive": 0.004}
-for region, multiplier in REGION_MULTIPLIERS.items():
-    FALLBACK_PRICING["S3"][region] = {
-        storage_class: round(price * multiplier, 4)
-        for storage_class, price in S3_BASE.items()
-    }
 
-# Generate VPC pricing for all regions
-VPC_BASE = {"NatGateway": 0.045, "VPN": 0.05}
-for region, multiplier in REGION_MULTIPLIERS.items():
-    FALLBACK_PRICING["VPC"][region] = {
-        component: round(price * multiplier, 4)
-        for component, price in VPC_BASE.items()
-    }
+def _scale_prices(base, multiplier: float):
+    """Scale every price in a (possibly nested) base table by a region multiplier"""
+    if isinstance(base, dict):
+        return {key: _scale_prices(value, multiplier) for key, value in base.items()}
+    return round(base * multiplier, 4)
 
-# Generate ALB pricing for all regions
+
+S3_BASE = {"General Purpose": 0.023, "Infrequent Access": 0.0125, "Archive": 0.004}
+VPC_BASE = {"NatGateway": 0.045, "VPN": 0.05}
 ALB_BASE = 0.0225
-for region, multiplier in REGION_MULTIPLIERS.items():
-    FALLBACK_PRICING["ALB"][region] = round(ALB_BASE * multiplier, 4)
+
+
+def _intern_keys(node):
+    """Intern the keys of a nested pricing dict so repeated names share one string"""
+    if isinstance(node, dict):
+        return {sys.intern(key): _intern_keys(value) for key, value in node.items()}
+    return node
+
+
+@functools.cache
+def _source_version() -> str:
+    """
+    Fingerprint of the modules the pricing is generated from, stored as the cache's ETag.
+    
+    Hashing the source files is far cheaper than generating the pricing, and
+    any edit to the prices or to the cache layout invalidates the cache.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in (__file__, comprehensive_pricing.__file__):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def fallback_pricing() -> Dict:
+    """
+    Fallback pricing with the regional tables generated from the US East base prices.
+    
+    Built on each call rather than at import, so importing the module stays
+    cheap, and returned as a new dict that nothing else keeps, so the caller
+    can release the nested RDS table once it has packed it.
+    """
+    bases = (("RDS", RDS_BASE_US_EAST), ("S3", S3_BASE), ("VPC", VPC_BASE), ("ALB", ALB_BASE))
+    tables = {service: {} for service, _ in bases}
+    # Regions priced alike share one read-only set of scaled tables
+    scaled = {}
+    for region, multiplier in REGION_MULTIPLIERS.items():
+        if multiplier not in scaled:
+            scaled[multiplier] = [_scale_prices(base, multiplier) for _, base in bases]
+        for (service, _), table in zip(bases, scaled[multiplier]):
+            tables[service][region] = table
+    return {**FALLBACK_PRICING, **tables}
+
+
+# Services answered from dense tables rather than their nested pricing dicts:
+# EC2 from comprehensive_pricing, RDS from LivePricingScraper.price_tables
+PACKED_SERVICES = ('EC2', 'RDS')
+
+# Hours in a billing month
+HOURS_PER_MONTH = 730
+
+# (hourly price, monthly cost per unit) for regions/components without data;
+# the VPC default is NAT Gateway pricing
+_DEFAULT_VPC_RATE = (0.045, 0.045 * HOURS_PER_MONTH)
+_DEFAULT_ALB_RATE = (0.0225, 0.0225 * HOURS_PER_MONTH)
+
+# Size token -> (vCPU, memory) estimates; xlarge vCPUs depend on the full type
+_SIZE_RE = re.compile(r'nano|micro|small|medium|xlarge|large')
+_SIZE_META = {
+    'nano': ('1', 'N/A'),
+    'micro': ('1-2', '1 GiB'),
+    'small': ('1-2', '2 GiB'),
+    'medium': ('2', '4 GiB'),
+    'large': ('2', '8 GiB'),
+    'xlarge': (None, '16+ GiB')
+}
+# Instance family letter -> network performance
+_NETWORK_BY_FAMILY = {'t': 'Low to Moderate', 'c': 'High', 'r': 'High'}
+
+
+@dataclass(slots=True)
+class PriceTable:
+    """
+    Dense price table: one flat array of doubles plus a key -> position index per axis.
+    
+    Prices are laid out row-major over the axes, e.g. (region, instance type,
+    operating system) for EC2. Missing combinations hold NaN. prices is an
+    array('d'), or a read-only memoryview when mapped from the cache file.
+    """
+    axes: Tuple[Dict[str, int], ...]
+    prices: Sequence[float]
+    
+    @classmethod
+    def from_nested(cls, data: Dict, depth: int) -> 'PriceTable':
+        """Pack a nested {key: {key: ... price}} dict that is depth levels deep"""
+        axes = tuple({} for _ in range(depth))
+        
+        def collect(node: Dict, level: int):
+            for key, child in node.items():
+                axes[level].setdefault(key, len(axes[level]))
+                if level + 1 < depth:
+                    collect(child, level + 1)
+        
+        def fill(node: Dict, level: int, offset: int):
+            for key, child in node.items():
+                position = offset * len(axes[level]) + axes[level][key]
+                if level + 1 < depth:
+                    fill(child, level + 1, position)
+                else:
+                    prices[position] = child
+        
+        collect(data, 0)
+        prices = array('d', [math.nan]) * math.prod(len(axis) for axis in axes)
+        fill(data, 0, 0)
+        return cls(axes, prices)
+    
+    def get(self, keys: Tuple[str, ...], default=0):
+        """Price at keys (one per axis), or default if there is none"""
+        offset = 0
+        for axis, key in zip(self.axes, keys):
+            position = axis.get(key)
+            if position is None:
+                return default
+            offset = offset * len(axis) + position
+        price = self.prices[offset]
+        return default if math.isnan(price) else price
+
+
+@dataclass(slots=True, frozen=True)
+class PriceEntry:
+    """One on-demand price of a bulk pricing row"""
+    amount: str
+    unit: str
+    description: str
+
+
+@dataclass(slots=True, frozen=True)
+class InstancePriceRow:
+    """Bulk pricing for one EC2 or RDS instance, serialized by orjson as a JSON object"""
+    instanceType: str
+    location: str
+    vcpu: str
+    memory: str
+    storage: str
+    networkPerformance: str
+    prices: Tuple[PriceEntry, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class LoadedPricing:
+    """One load of the pricing data, published to readers as a whole"""
+    data: Dict
+    tables: Dict[str, PriceTable]
+    # Instance types per packed service
+    instance_counts: Dict[str, int]
+    updated: Optional[datetime]
 
 
 class LivePricingScraper:
     """Scrapes live pricing from AWS official sources"""
     
     def __init__(self):
-        """Initialize scraper"""
-        self.pricing_data = {}
-        self.last_updated = None
+        """Initialize scraper; pricing is loaded on first use (or by warmup())"""
+        self._pricing = LoadedPricing({}, {}, {}, None)
+        # Set last, under _load_lock, once a complete load has been published
+        self._loaded = False
+        # Reentrant so fetch_all_pricing can take it when _ensure_loaded already holds it
+        self._load_lock = threading.RLock()
+    
+    @property
+    def pricing_data(self) -> Dict:
+        """Pricing tables by service, loaded on first access"""
+        self._ensure_loaded()
+        return self._pricing.data
+    
+    @property
+    def instance_counts(self) -> Dict[str, int]:
+        """Instance types per packed service in the loaded data"""
+        self._ensure_loaded()
+        return self._pricing.instance_counts
+    
+    @property
+    def last_updated(self) -> Optional[datetime]:
+        """When the pricing data was loaded"""
+        self._ensure_loaded()
+        return self._pricing.updated
+    
+    def _ensure_loaded(self):
+        """Load pricing once, the first time anything needs it"""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self.fetch_all_pricing()
+    
+    def warmup(self) -> 'LivePricingScraper':
+        """Load pricing and build the lookup tables now rather than on the first query"""
+        self._ensure_loaded()
+        self.price_index
+        self.price_tables
+        self.hourly_rates
+        return self
     
     def fetch_all_pricing(self) -> Dict:
         """Fetch all pricing data"""
         logger.info("📊 Loading AWS pricing data...")
         
-        # Use comprehensive fallback pricing (regularly updated)
-        # This includes 40+ EC2 instance types with official pricing
-        self.pricing_data = FALLBACK_PRICING.copy()
+        with self._load_lock:
+            updated = datetime.now()
+            cached = self.load_cache()
+            if cached is not None:
+                data, tables, counts = cached
+            else:
+                # Use comprehensive fallback pricing (regularly updated)
+                # This includes 40+ EC2 instance types with official pricing.
+                logger.info("📦 Using fallback pricing")
+                data = fallback_pricing()
+                tables = self._pack_price_tables(data)
+                counts = {'EC2': ec2_instance_count(), 'RDS': self._count_instances(data.get('RDS', {}))}
+                # The nested RDS dict is packed into tables, so it is released here,
+                # before the data is published, rather than kept alongside the table
+                data = {service: table for service, table in data.items() if service not in PACKED_SERVICES}
+                if self.save_cache(data, tables, counts, updated):
+                    # Map the tables just written, so processes that load pricing
+                    # separately share one copy of the prices
+                    tables = self._map_price_tables() or tables
+            
+            # One assignment publishes the data, tables and counts together
+            self._pricing = LoadedPricing(data, tables, counts, updated)
+            # Rebuild the lookup tables and memoized lookups from the new data on next access
+            self.__dict__.pop('price_index', None)
+            self.__dict__.pop('hourly_rates', None)
+            self.clear_lookups()
+            self._loaded = True
         
-        # Add other services
-        self._add_other_services()
+        logger.info(f"✅ Loaded {counts['EC2']} EC2 instance types")
+        logger.info(f"✅ Loaded {counts['RDS']} RDS instance types") 
+        logger.info(f"✅ Pricing data ready at {updated.strftime('%H:%M:%S')}")
         
-        self.last_updated = datetime.now()
-        self.save_cache()
+        return data
+    
+    def clear_lookups(self):
+        """Drop the memoized lookup results, so the next queries recompute them"""
+        self.find_ec2_pricing.cache_clear()
+        self.find_rds_pricing.cache_clear()
+        self.find_ec2_pricing_bytes.cache_clear()
+        self.find_rds_pricing_bytes.cache_clear()
+        self.instance_types.cache_clear()
+    
+    @functools.cached_property
+    def price_index(self) -> Dict[tuple, object]:
+        """
+        Flat (service, region, key) -> price lookup for S3/Route53, built on first use.
         
-        # Count instances
-        ec2_count = self._count_instances(self.pricing_data.get('EC2', {}))
-        rds_count = self._count_instances(self.pricing_data.get('RDS', {}))
+        key is the storage class for S3 and the component for Route53, whose
+        prices have no region. RDS prices live in price_tables, EC2 prices in
+        comprehensive_pricing's dense tables, and VPC and ALB prices in
+        hourly_rates.
+        """
+        data = self.pricing_data
+        index = {
+            ('S3', region, storage_class): price
+            for region, entries in data.get('S3', {}).items()
+            for storage_class, price in entries.items()
+        }
+        index.update(
+            (('Route53', None, component), price) for component, price in data.get('Route53', {}).items()
+        )
+        return index
+    
+    @functools.cached_property
+    def hourly_rates(self) -> Dict[tuple, Tuple[float, float]]:
+        """
+        (service, region, key) -> (hourly price, monthly cost per unit) for VPC/ALB, built on first use.
         
-        logger.info(f"✅ Loaded {ec2_count} EC2 instance types")
-        logger.info(f"✅ Loaded {rds_count} RDS instance types") 
-        logger.info(f"✅ Pricing data ready at {self.last_updated.strftime('%H:%M:%S')}")
+        key is the component for VPC; ALB prices have no key.
+        """
+        data = self.pricing_data
+        rates = {
+            ('VPC', region, component): (price, price * HOURS_PER_MONTH)
+            for region, entries in data.get('VPC', {}).items()
+            for component, price in entries.items()
+        }
+        rates.update(
+            (('ALB', region, None), (price, price * HOURS_PER_MONTH))
+            for region, price in data.get('ALB', {}).items()
+        )
+        return rates
+    
+    @property
+    def price_tables(self) -> Dict[str, PriceTable]:
+        """
+        Dense RDS price table, built when pricing is loaded.
         
-        return self.pricing_data
+        RDS is keyed (region, instance type, engine, deployment); EC2 prices
+        come from comprehensive_pricing's own dense tables. When the cache on disk is
+        current, the tables are memory-mapped from it, so processes that load
+        pricing separately share one copy of the prices.
+        """
+        self._ensure_loaded()
+        return self._pricing.tables
     
-    def _add_other_services(self):
-        """Other services are already in FALLBACK_PRICING, no need to add them"""
-        # S3, VPC, ALB, Route53 are already in FALLBACK_PRICING
-        # This method is kept for backward compatibility but does nothing
-        pass
+    @staticmethod
+    def _pack_price_tables(data: Dict) -> Dict[str, PriceTable]:
+        """Pack the nested RDS pricing dict into a dense table"""
+        return {'RDS': PriceTable.from_nested(data.get('RDS', {}), 4)}
     
     def _get_region_name(self, region_code: str) -> str:
         """Convert region code to display name"""
@@ -186,207 +456,266 @@ class LivePricingScraper:
     
     def _count_instances(self, pricing_data: Dict) -> int:
         """Count total instance types"""
-        count = 0
-        for region, instances in pricing_data.items():
-            count += len(instances)
-        return count
+        return sum(map(len, pricing_data.values()))
     
-    def save_cache(self):
-        """Save pricing data to cache"""
+    def save_cache(self, data: Dict, tables: Dict[str, PriceTable], counts: Dict[str, int],
+                   updated: datetime) -> bool:
+        """
+        Save pricing data, its dense tables and instance counts for load_cache.
+        
+        Returns True when the files were written.
+        """
         try:
             os.makedirs(CACHE_DIR, exist_ok=True)
+            # The cache is only read back by load_cache, so it is written compactly
             cache_data = {
-                'updated': self.last_updated.isoformat() if self.last_updated else datetime.now().isoformat(),
-                'data': self.pricing_data
+                'updated': updated,
+                'data': data,
+                'counts': counts
             }
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            # Write to temp files and swap in, the ETag last, so a cache is
+            # only used once all of its files are in place
+            with open(CACHE_FILE + '.tmp', 'wb') as f:
+                f.write(gzip.compress(_dumps(cache_data), mtime=0))
+            self._write_price_tables(tables)
+            with open(CACHE_ETAG_FILE + '.tmp', 'w') as f:
+                f.write(_source_version())
+            for path in (CACHE_FILE, CACHE_TABLES_FILE, CACHE_TABLES_INDEX_FILE, CACHE_ETAG_FILE):
+                os.replace(path + '.tmp', path)
             logger.info(f"💾 Pricing cached to {CACHE_FILE}")
+            return True
         except Exception as e:
             logger.warning(f"Failed to save cache: {e}")
+            return False
     
-    def load_cache(self) -> Dict:
-        """Load pricing from cache or fallback"""
-        if os.path.exists(CACHE_FILE):
-            try:
-                with open(CACHE_FILE, 'r') as f:
-                    cached = json.load(f)
-                    logger.info("📦 Loaded pricing from cache")
-                    return cached.get('data', FALLBACK_PRICING)
-            except Exception as e:
-                logger.warning(f"Failed to load cache: {e}")
-        
-        logger.info("📦 Using fallback pricing")
-        return FALLBACK_PRICING.copy()
+    def _write_price_tables(self, tables: Dict[str, PriceTable]):
+        """Write dense tables to temp files: raw native doubles plus a JSON index of their axes"""
+        index = {'byteorder': sys.byteorder, 'tables': {}}
+        offset = 0
+        with open(CACHE_TABLES_FILE + '.tmp', 'wb') as f:
+            for name, table in tables.items():
+                table.prices.tofile(f)
+                index['tables'][name] = {
+                    'axes': [list(axis) for axis in table.axes],
+                    'offset': offset,
+                    'size': len(table.prices)
+                }
+                offset += len(table.prices)
+        with open(CACHE_TABLES_INDEX_FILE + '.tmp', 'wb') as f:
+            f.write(_dumps(index))
     
-    def find_ec2_pricing(self, instance_type: str, region: str, os: str = 'Linux') -> List[Dict]:
-        """Find EC2 pricing from scraped data"""
+    def _map_price_tables(self) -> Optional[Dict[str, PriceTable]]:
+        """Memory-map the dense tables written by save_cache, or None if they can't be used"""
         try:
-            region_pricing = self.pricing_data.get('EC2', {}).get(region, {})
-            instance_pricing = region_pricing.get(instance_type, {})
-            hourly_price = instance_pricing.get(os, 0)
-            
-            # Fallback to US East if not found
-            if hourly_price == 0:
-                us_pricing = self.pricing_data.get('EC2', {}).get('US East (N. Virginia)', {})
-                hourly_price = us_pricing.get(instance_type, {}).get(os, 0)
-            
-            return [{
-                'instanceType': instance_type,
-                'location': region,
-                'vcpu': self._get_instance_vcpu(instance_type),
-                'memory': self._get_instance_memory(instance_type),
-                'storage': 'EBS only',
-                'networkPerformance': self._get_network_performance(instance_type),
-                'prices': [{
-                    'amount': str(hourly_price),
-                    'unit': 'Hrs',
-                    'description': f'{instance_type} {os} on-demand'
-                }]
-            }]
-        except Exception as e:
-            logger.error(f"Error finding EC2 pricing: {e}")
-            return []
+            with open(CACHE_TABLES_INDEX_FILE, 'rb') as f:
+                index = _loads(f.read())
+            if index['byteorder'] != sys.byteorder:
+                return None
+            with open(CACHE_TABLES_FILE, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # A truncated or partly written file can't be viewed as doubles
+            if len(buffer) % PRICE_ITEMSIZE:
+                raise ValueError(f"{CACHE_TABLES_FILE} is {len(buffer)} bytes, not a whole number of prices")
+            prices = memoryview(buffer).cast('d')
+            tables = {}
+            for name, meta in index['tables'].items():
+                axes = tuple({sys.intern(key): position for position, key in enumerate(axis)} for axis in meta['axes'])
+                offset, size = meta['offset'], meta['size']
+                if not (isinstance(offset, int) and isinstance(size, int)
+                        and 0 <= offset <= offset + size <= len(prices)
+                        and size == math.prod(len(axis) for axis in axes)):
+                    raise ValueError(f"index entry for {name} doesn't match {CACHE_TABLES_FILE}")
+                tables[name] = PriceTable(axes, prices[offset:offset + size])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Failed to map price tables: {e}")
+            return None
+        return tables
     
-    def find_rds_pricing(self, instance_type: str, region: str, engine: str, deployment: str) -> List[Dict]:
-        """Find RDS pricing from scraped data"""
+    def _read_cache_etag(self) -> Optional[str]:
+        """Read the ETag stored alongside the cache file"""
         try:
-            region_pricing = self.pricing_data.get('RDS', {}).get(region, {})
-            instance_pricing = region_pricing.get(instance_type, {})
-            engine_pricing = instance_pricing.get(engine, {})
-            hourly_price = engine_pricing.get(deployment, 0)
-            
-            if hourly_price == 0:
-                us_pricing = self.pricing_data.get('RDS', {}).get('US East (N. Virginia)', {})
-                hourly_price = us_pricing.get(instance_type, {}).get(engine, {}).get(deployment, 0)
-            
-            return [{
-                'instanceType': instance_type,
-                'location': region,
-                'vcpu': self._get_instance_vcpu(instance_type.replace('db.', '')),
-                'memory': self._get_instance_memory(instance_type.replace('db.', '')),
-                'storage': 'EBS',
-                'networkPerformance': 'Moderate',
-                'prices': [{
-                    'amount': str(hourly_price),
-                    'unit': 'Hrs',
-                    'description': f'{instance_type} {engine} {deployment}'
-                }]
-            }]
+            with open(CACHE_ETAG_FILE, 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+    
+    def load_cache(self) -> Optional[Tuple[Dict, Dict[str, PriceTable], Dict[str, int]]]:
+        """
+        Read (data, tables, counts) from the cache, or None if there is no usable cache.
+        
+        A cache is only used when its ETag matches _source_version(), i.e. it
+        was written from the same pricing source. The tables are memory-mapped
+        rather than packed again.
+        """
+        if self._read_cache_etag() != _source_version():
+            return None
+        try:
+            with open(CACHE_FILE, 'rb') as f:
+                cached = _loads(gzip.decompress(f.read()))
+            # Parsed keys are fresh strings per occurrence; every region
+            # repeats the same storage class and component names
+            data, counts = _intern_keys(cached['data']), cached['counts']
         except Exception as e:
-            logger.error(f"Error finding RDS pricing: {e}")
-            return []
+            logger.warning(f"Failed to load cache: {e}")
+            return None
+        tables = self._map_price_tables()
+        if tables is None:
+            return None
+        logger.info("📦 Loaded pricing from cache")
+        return data, tables, counts
+    
+    @functools.lru_cache(maxsize=4096)
+    def find_ec2_pricing(self, instance_type: str, region: str, os: str = 'Linux') -> List[InstancePriceRow]:
+        """
+        Find EC2 pricing (memoized; treat the result as read-only).
+        
+        Priced from comprehensive_pricing's dense id-indexed tables, which hold
+        the same prices as the expanded EC2 pricing data.
+        """
+        hourly_price = get_ec2_price(region, instance_type, os)
+        
+        # Fallback to US East if not found
+        if not hourly_price:
+            hourly_price = get_ec2_price(BASE_REGION, instance_type, os)
+        if hourly_price is None:
+            hourly_price = 0
+        
+        vcpu, memory, network = self._instance_meta(instance_type)
+        
+        return [InstancePriceRow(
+            instanceType=instance_type,
+            location=region,
+            vcpu=vcpu,
+            memory=memory,
+            storage='EBS only',
+            networkPerformance=network,
+            prices=(PriceEntry(
+                amount=str(hourly_price),
+                unit='Hrs',
+                description=f'{instance_type} {os} on-demand'
+            ),)
+        )]
+    
+    @functools.lru_cache(maxsize=4096)
+    def find_rds_pricing(self, instance_type: str, region: str, engine: str, deployment: str) -> List[InstancePriceRow]:
+        """Find RDS pricing from scraped data (memoized; treat the result as read-only)"""
+        self._ensure_loaded()
+        rds_prices = self.price_tables['RDS']
+        hourly_price = rds_prices.get((region, instance_type, engine, deployment))
+        
+        if hourly_price == 0:
+            hourly_price = rds_prices.get((BASE_REGION, instance_type, engine, deployment))
+        
+        vcpu, memory, _ = self._instance_meta(instance_type.replace('db.', ''))
+        
+        return [InstancePriceRow(
+            instanceType=instance_type,
+            location=region,
+            vcpu=vcpu,
+            memory=memory,
+            storage='EBS',
+            networkPerformance='Moderate',
+            prices=(PriceEntry(
+                amount=str(hourly_price),
+                unit='Hrs',
+                description=f'{instance_type} {engine} {deployment}'
+            ),)
+        )]
+    
+    @functools.lru_cache(maxsize=4096)
+    def find_ec2_pricing_bytes(self, instance_type: str, region: str, os: str = 'Linux') -> bytes:
+        """find_ec2_pricing encoded as JSON, for handlers that write it straight into a response"""
+        return _dumps(self.find_ec2_pricing(instance_type, region, os))
+    
+    @functools.lru_cache(maxsize=4096)
+    def find_rds_pricing_bytes(self, instance_type: str, region: str, engine: str, deployment: str) -> bytes:
+        """find_rds_pricing encoded as JSON, for handlers that write it straight into a response"""
+        return _dumps(self.find_rds_pricing(instance_type, region, engine, deployment))
+    
+    @functools.lru_cache(maxsize=64)
+    def instance_types(self, region: str) -> Tuple[str, ...]:
+        """Sorted EC2 instance types priced in a region (memoized)"""
+        return ec2_instance_types(region)
     
     def find_s3_pricing(self, storage_class: str, region: str, storage_gb: float = 0) -> List[Dict]:
         """Find S3 pricing"""
-        try:
-            region_pricing = self.pricing_data.get('S3', {}).get(region, {})
-            price_per_gb = region_pricing.get(storage_class, 0.023)
-            monthly_cost = price_per_gb * storage_gb
-            
-            return [{
-                'service': 'S3',
-                'storageClass': storage_class,
-                'location': region,
-                'storageGB': storage_gb,
-                'prices': [{
-                    'amount': str(price_per_gb),
-                    'monthly_cost': monthly_cost,
-                    'unit': 'GB-Mo'
-                }]
+        self._ensure_loaded()
+        price_per_gb = self.price_index.get(('S3', region, storage_class), 0.023)
+        monthly_cost = price_per_gb * storage_gb
+        
+        return [{
+            'service': 'S3',
+            'storageClass': storage_class,
+            'location': region,
+            'storageGB': storage_gb,
+            'prices': [{
+                'amount': str(price_per_gb),
+                'monthly_cost': monthly_cost,
+                'unit': 'GB-Mo'
             }]
-        except Exception as e:
-            logger.error(f"Error finding S3 pricing: {e}")
-            return []
+        }]
     
     def find_vpc_pricing(self, component: str, region: str, quantity: int = 1) -> List[Dict]:
         """Find VPC pricing"""
-        try:
-            region_pricing = self.pricing_data.get('VPC', {}).get(region, {})
-            hourly_price = region_pricing.get(component, 0.045)  # Default NAT Gateway pricing
-            monthly_cost = hourly_price * 730 * quantity
-            
-            return [{
-                'service': 'VPC',
-                'productFamily': component,
-                'location': region,
-                'prices': [{
-                    'amount': str(hourly_price),
-                    'monthly_cost': monthly_cost,
-                    'unit': 'Hrs'
-                }]
+        self._ensure_loaded()
+        hourly_price, monthly_rate = self.hourly_rates.get(('VPC', region, component), _DEFAULT_VPC_RATE)
+        monthly_cost = monthly_rate * quantity
+        
+        return [{
+            'service': 'VPC',
+            'productFamily': component,
+            'location': region,
+            'prices': [{
+                'amount': str(hourly_price),
+                'monthly_cost': monthly_cost,
+                'unit': 'Hrs'
             }]
-        except Exception as e:
-            logger.error(f"Error finding VPC pricing: {e}")
-            return []
+        }]
     
     def find_alb_pricing(self, region: str, quantity: int = 1) -> List[Dict]:
         """Find ALB pricing"""
-        try:
-            hourly_price = self.pricing_data.get('ALB', {}).get(region, 0.0225)
-            monthly_cost = hourly_price * 730 * quantity
-            
-            return [{
-                'service': 'ALB',
-                'productFamily': 'Load Balancer-Application',
-                'location': region,
-                'prices': [{
-                    'amount': str(hourly_price),
-                    'monthly_cost': monthly_cost,
-                    'unit': 'Hrs'
-                }]
+        self._ensure_loaded()
+        hourly_price, monthly_rate = self.hourly_rates.get(('ALB', region, None), _DEFAULT_ALB_RATE)
+        monthly_cost = monthly_rate * quantity
+        
+        return [{
+            'service': 'ALB',
+            'productFamily': 'Load Balancer-Application',
+            'location': region,
+            'prices': [{
+                'amount': str(hourly_price),
+                'monthly_cost': monthly_cost,
+                'unit': 'Hrs'
             }]
-        except Exception as e:
-            logger.error(f"Error finding ALB pricing: {e}")
-            return []
+        }]
     
     def find_route53_pricing(self, component: str, quantity: int = 1) -> List[Dict]:
         """Find Route53 pricing"""
-        try:
-            monthly_price = self.pricing_data.get('Route53', {}).get(component, 0.50)
-            total_monthly = monthly_price * quantity
-            
-            return [{
-                'service': 'Route53',
-                'productFamily': component,
-                'prices': [{
-                    'amount': str(monthly_price),
-                    'monthly_cost': total_monthly,
-                    'unit': 'Month'
-                }]
+        self._ensure_loaded()
+        monthly_price = self.price_index.get(('Route53', None, component), 0.50)
+        total_monthly = monthly_price * quantity
+        
+        return [{
+            'service': 'Route53',
+            'productFamily': component,
+            'prices': [{
+                'amount': str(monthly_price),
+                'monthly_cost': total_monthly,
+                'unit': 'Month'
             }]
-        except Exception as e:
-            logger.error(f"Error finding Route53 pricing: {e}")
-            return []
-    
-    def _get_instance_vcpu(self, instance_type: str) -> str:
-        """Estimate vCPU from instance type"""
-        # Common patterns
-        if 'nano' in instance_type: return '1'
-        if 'micro' in instance_type: return '1-2'
-        if 'small' in instance_type: return '1-2'
-        if 'medium' in instance_type: return '2'
-        if 'large' in instance_type and 'xlarge' not in instance_type: return '2'
-        if 'xlarge' in instance_type:
-            multiplier = instance_type.count('x') + 1
-            return str(2 * multiplier)
-        return 'N/A'
-    
-    def _get_instance_memory(self, instance_type: str) -> str:
-        """Estimate memory from instance type"""
-        if 'micro' in instance_type: return '1 GiB'
-        if 'small' in instance_type: return '2 GiB'
-        if 'medium' in instance_type: return '4 GiB'
-        if 'large' in instance_type and 'xlarge' not in instance_type: return '8 GiB'
-        if 'xlarge' in instance_type: return '16+ GiB'
-        return 'N/A'
-    
-    def _get_network_performance(self, instance_type: str) -> str:
-        """Get network performance"""
-        if instance_type.startswith('t'): return 'Low to Moderate'
-        if instance_type.startswith('c'): return 'High'
-        if instance_type.startswith('r'): return 'High'
-        return 'Moderate'
+        }]
+    
+    def _instance_meta(self, instance_type: str) -> Tuple[str, str, str]:
+        """Estimate (vCPU, memory, network performance) from the instance type"""
+        match = _SIZE_RE.search(instance_type)
+        if match is None:
+            vcpu, memory = 'N/A', 'N/A'
+        else:
+            vcpu, memory = _SIZE_META[match.group()]
+            if vcpu is None:
+                # xlarge sizes scale with the number of x's in the name
+                vcpu = str(2 * (instance_type.count('x') + 1))
+        return vcpu, memory, _NETWORK_BY_FAMILY.get(instance_type[:1], 'Moderate')
 
 
 # Singleton
@@ -396,8 +725,8 @@ def get_live_pricing_scraper() -> LivePricingScraper:
     """Get or create scraper singleton"""
     global _scraper
     if _scraper is None:
+        # Pricing loads on the first lookup; call warmup() to load it eagerly
         _scraper = LivePricingScraper()
-        _scraper.fetch_all_pricing()  # Fetch on first access
     return _scraper
 
 
@@ -409,5 +738,6 @@ def get_bulk_pricing_client():
 
 if __name__ == "__main__":
     scraper = get_live_pricing_scraper()
-    print(f"\nTotal EC2 instances: {scraper._count_instances(scraper.pricing_data.get('EC2', {}))}")
+    scraper.warmup()
+    print(f"\nTotal EC2 instances: {scraper.instance_counts['EC2']}")
     print(f"Last updated: {scraper.last_updated}")
@@ -1,12 +1,27 @@
 """
 Comprehensive AWS Pricing Data
 All regions and EC2 instance types with official pricing (January 2026)
+
+Importing this module is cheap: EC2_PRICING (every region expanded with the
+full instance catalog) and the dense price tables are built the first time
+they are accessed.
 """
 
-# EC2 pricing organized by region
+import functools
+import itertools
+import logging
+import math
+import sys
+from array import array
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# EC2 pricing organized by region, as published; the remaining regions are
+# filled in by get_all_regions_pricing()
 # Format: region -> instance_type -> os -> hourly_price
 
-EC2_PRICING = {
+_EC2_CATALOG = {
     "US East (N. Virginia)": {
         # T-series (Burstable Performance)
         "t2.nano": {"Linux": 0.0058, "Windows": 0.0104},
@@ -291,27 +306,158 @@ REGION_MULTIPLIERS = {
     "China (Ningxia)": 1.10
 }
 
-# To save space, we copy the full US East instance list to other regions
-# In production, you'd fetch region-specific pricing from AWS
+# The catalog only lists a few hand-coded prices outside US East; every other
+# regional price is the US East price scaled by the region's multiplier
+BASE_REGION = "US East (N. Virginia)"
+
+# Nested form of the catalog with every region spelled out, for EC2_PRICING;
+# price lookups use the dense tables below instead
 def get_all_regions_pricing():
     """Expand all regions with full instance catalog using regional multipliers"""
-    us_east_instances = EC2_PRICING["US East (N. Virginia)"]
+    pricing = {region: dict(region_prices) for region, region_prices in _EC2_CATALOG.items()}
+    us_east_instances = pricing[BASE_REGION]
+    # Regions priced alike share one read-only scaled copy of the catalog
+    scaled_catalogs = {}
     
     # Apply regional pricing to all regions
     for region, multiplier in REGION_MULTIPLIERS.items():
-        if region not in EC2_PRICING:
-            EC2_PRICING[region] = {}
+        region_prices = pricing.setdefault(region, {})
+        
+        scaled = scaled_catalogs.get(multiplier)
+        if scaled is None:
+            scaled = scaled_catalogs[multiplier] = {
+                instance_type: {os: round(price * multiplier, 4) for os, price in os_prices.items()}
+                for instance_type, os_prices in us_east_instances.items()
+            }
         
         # Copy all instances from US East with regional multiplier
-        for instance_type, os_prices in us_east_instances.items():
-            if instance_type not in EC2_PRICING[region]:
-                EC2_PRICING[region][instance_type] = {
-                    os: round(price * multiplier, 4)
-                    for os, price in os_prices.items()
-                }
+        for instance_type, os_prices in scaled.items():
+            if instance_type not in region_prices:
+                region_prices[instance_type] = os_prices
+    return pricing
+
+
+def instance_types(region: str) -> Tuple[str, ...]:
+    """Sorted EC2 instance types that EC2_PRICING lists for a region, without expanding it"""
+    listed = _EC2_CATALOG.get(region, {})
+    if region == BASE_REGION or region in REGION_MULTIPLIERS:
+        # Expanded regions get the whole US East catalog as well
+        return tuple(sorted(listed.keys() | _EC2_CATALOG[BASE_REGION].keys()))
+    return tuple(sorted(listed))
+
+
+@functools.cache
+def _expanded_pricing():
+    """EC2_PRICING: the catalog expanded to every region, on first use"""
+    pricing = get_all_regions_pricing()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Loaded EC2 pricing for %d regions, %d configurations",
+                     len(pricing), len(pricing) * len(next(iter(pricing.values()))))
+    return pricing
+
+
+# Compact EC2 pricing for lookups: a key -> position index per axis, the US
+# East prices as one array (instance type, os), the regional multipliers
+# aligned with the region index, and the hand-coded regional prices keyed by
+# (region, instance type, os) ids. Prices are stored as int32 micro-dollars
+# (every catalog price has at most 4 decimals, so they convert back exactly);
+# missing US East prices hold _MISSING_PRICE.
+OS_INDEX = {"Linux": 0, "Windows": 1}
+PRICE_SCALE = 1_000_000
+_MISSING_PRICE = -1
+
+# Module attributes backed by _dense_tables(), in the order it returns them
+_DENSE_TABLE_NAMES = ('REGION_INDEX', 'INSTANCE_INDEX', 'US_EAST_PRICES', 'REGION_MULTIPLIER_ARRAY',
+                      'PRICE_OVERRIDES')
+
+@functools.cache
+def _dense_tables():
+    """Build the indexes, the US East price array, the aligned multipliers and the overrides"""
+    # Interned so callers passing the same names hit the fast identity check
+    regions = {}
+    for region in itertools.chain(_EC2_CATALOG, REGION_MULTIPLIERS):
+        regions.setdefault(sys.intern(region), len(regions))
+    instances = {}
+    for region_prices in _EC2_CATALOG.values():
+        for instance_type in region_prices:
+            instances.setdefault(sys.intern(instance_type), len(instances))
+    
+    us_east = array('i', [_MISSING_PRICE]) * (len(instances) * len(OS_INDEX))
+    for instance_type, os_prices in _EC2_CATALOG[BASE_REGION].items():
+        for os, price in os_prices.items():
+            us_east[instances[instance_type] * len(OS_INDEX) + OS_INDEX[os]] = round(price * PRICE_SCALE)
+    
+    # REGION_MULTIPLIERS aligned with REGION_INDEX, so a region's multiplier is
+    # one array read by position instead of a string-keyed dict probe
+    multipliers = array('d', (REGION_MULTIPLIERS.get(region, 1.0) for region in regions))
+    overrides = {
+        (regions[region], instances[instance_type], OS_INDEX[os]): round(price * PRICE_SCALE)
+        for region, region_prices in _EC2_CATALOG.items() if region != BASE_REGION
+        for instance_type, os_prices in region_prices.items()
+        for os, price in os_prices.items()
+    }
+    return regions, instances, us_east, multipliers, overrides
+
+def lookup_ids(region: str, instance_type: str, os: str = "Linux") -> Tuple[int, int, int]:
+    """
+    Resolve names to their (region, instance type, os) positions in the dense tables.
+    
+    Callers that price the same configuration repeatedly can resolve it once
+    and use get_price_by_ids() from then on.
+    
+    Raises:
+        KeyError: If any of the names is unknown
+    """
+    regions, instances = _dense_tables()[:2]
+    return regions[region], instances[instance_type], OS_INDEX[os]
+
+def _hourly_price(tables, region_id: int, instance_id: int, os_id: int) -> float:
+    """Hourly price from the _dense_tables() tuple, or NaN if there is none"""
+    _, _, us_east, multipliers, overrides = tables
+    quantized = overrides.get((region_id, instance_id, os_id))
+    if quantized is not None:
+        return quantized / PRICE_SCALE
+    quantized = us_east[instance_id * len(OS_INDEX) + os_id]
+    if quantized == _MISSING_PRICE:
+        return math.nan
+    # Scaled in floating point and rounded exactly as the EC2_PRICING expansion does
+    return round(quantized / PRICE_SCALE * multipliers[region_id], 4)
+
+def get_price_by_ids(region_id: int, instance_id: int, os_id: int) -> Optional[float]:
+    """Hourly EC2 price for ids from lookup_ids(), or None if there is none"""
+    price = _hourly_price(_dense_tables(), region_id, instance_id, os_id)
+    return None if math.isnan(price) else price
+
+def instance_count() -> int:
+    """Number of (region, instance type) entries in EC2_PRICING, counted from the dense tables"""
+    regions, _, us_east, _, overrides = _dense_tables()
+    width = len(OS_INDEX)
+    us_east_ids = {position // width for position, price in enumerate(us_east) if price != _MISSING_PRICE}
+    listed = {region_id: set() for region_id in regions.values()}
+    for region_id, instance_id, _ in overrides:
+        listed[region_id].add(instance_id)
+    # Expanded regions list the whole US East catalog as well
+    expanded = {regions[region] for region in itertools.chain((BASE_REGION,), REGION_MULTIPLIERS)}
+    return sum(len(ids | us_east_ids) if region_id in expanded else len(ids) for region_id, ids in listed.items())
+
+def get_price(region: str, instance_type: str, os: str = "Linux") -> Optional[float]:
+    """Hourly EC2 price for a region, instance type and OS, or None if there is none"""
+    try:
+        ids = lookup_ids(region, instance_type, os)
+    except KeyError:
+        return None
+    return get_price_by_ids(*ids)
+
+
+def __getattr__(name):
+    """Build EC2_PRICING and the lookup tables the first time they are accessed (PEP 562)"""
+    if name == "EC2_PRICING":
+        return _expanded_pricing()
+    if name in _DENSE_TABLE_NAMES:
+        return _dense_tables()[_DENSE_TABLE_NAMES.index(name)]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Initialize full pricing
-get_all_regions_pricing()
 
-print(f"✅ Loaded EC2 pricing for {len(EC2_PRICING)} regions")
-print(f"✅ Total EC2 configurations: {len(EC2_PRICING) * len(list(EC2_PRICING.values())[0])}")
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    _expanded_pricing()
@@ -6,6 +6,9 @@ import json
 
 BASE_URL = "http://localhost:5000"
 
+# One pooled connection to the server for every request the script makes
+SESSION = requests.Session()
+
 services = [
     ("S3", "/api/pricing/s3", {
         "storageClass": "General Purpose",
@@ -19,10 +22,16 @@ services = [
     })
 ]
 
-for name, endpoint, payload in services:
-    print(f"\n{'='*60}")
-    print(f"{name} Response:")
-    print(f"{'='*60}")
-    r = requests.post(f'{BASE_URL}{endpoint}', json=payload)
-    data = r.json()
-    print(json.dumps(data, indent=2))
+def print_responses(session=SESSION):
+    """Print the raw response of each service, over a shared session"""
+    for name, endpoint, payload in services:
+        print(f"\n{'='*60}")
+        print(f"{name} Response:")
+        print(f"{'='*60}")
+        r = session.post(f'{BASE_URL}{endpoint}', json=payload)
+        data = r.json()
+        print(json.dumps(data, indent=2))
+
+
+if __name__ == "__main__":
+    print_responses()
@@ -3,70 +3,20 @@ Comprehensive Diagnostic Test Suite
 Tests each service individually and reports detailed results
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
 import requests
-import json
 
 BASE_URL = "http://localhost:5000"
 
-def test_service(name, endpoint, payload):
-    """Test a single service and print detailed results"""
-    print(f"\n{'='*60}")
-    print(f"Testing: {name}")
-    print(f"{'='*60}")
-    print(f"Endpoint: {endpoint}")
-    print(f"Payload: {json.dumps(payload, indent=2)}")
-    
-    try:
-        response = requests.post(f"{BASE_URL}{endpoint}", json=payload, timeout=10)
-        print(f"\nHTTP Status: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            print(f"Success: {data.get('success')}")
-            
-            if data.get('success'):
-                pricing_data = data.get('data', [])
-                print(f"Records returned: {len(pricing_data)}")
-                
-                if pricing_data:
-                    first = pricing_data[0]
-                    print(f"\nFirst result:")
-                    print(json.dumps(first, indent=2))
-                    
-                    # Check for $0 pricing
-                    prices = first.get('prices', [])
-                    if prices:
-                        amount = prices[0].get('amount', '0')
-                        monthly = prices[0].get('monthly_cost', 0)
-                        print(f"\n💰 Hourly Price: ${amount}")
-                        if monthly:
-                            print(f"💰 Monthly Cost: ${monthly}")
-                        
-                        if float(amount) == 0 and monthly == 0:
-                            print("⚠️  WARNING: Pricing is $0!")
-                    else:
-                        print("⚠️  WARNING: No pricing information!")
-                else:
-                    print("❌ ERROR: No pricing data returned!")
-            else:
-                print(f"❌ ERROR: {data.get('error')}")
-        else:
-            print(f"❌ HTTP Error: {response.text[:200]}")
-            
-    except Exception as e:
-        print(f"❌ Exception: {e}")
-    
-    print(f"{'='*60}\n")
-
+# One pooled connection to the server for every request the script makes
+SESSION = requests.Session()
 
-def run_diagnostic_tests():
-    """Run comprehensive diagnostic tests"""
-    print(f"\n{'#'*60}")
-    print("AWS PRICING CALCULATOR - COMPREHENSIVE DIAGNOSTIC TESTS")
-    print(f"{'#'*60}\n")
-    
+# (name, endpoint, payload) for each diagnostic test
+TEST_CASES = (
     # Test EC2
-    test_service(
+    (
         "EC2 - t2.micro Linux",
         "/api/pricing/ec2",
         {
@@ -75,9 +25,9 @@ def run_diagnostic_tests():
             "operatingSystem": "Linux",
             "tenancy": "Shared"
         }
-    )
+    ),
     
-    test_service(
+    (
         "EC2 - m5.large Windows",
         "/api/pricing/ec2",
         {
@@ -86,10 +36,10 @@ def run_diagnostic_tests():
             "operatingSystem": "Windows",
             "tenancy": "Shared"
         }
-    )
+    ),
     
     # Test RDS
-    test_service(
+    (
         "RDS - db.t3.micro MySQL Single-AZ",
         "/api/pricing/rds",
         {
@@ -98,10 +48,10 @@ def run_diagnostic_tests():
             "databaseEngine": "MySQL",
             "deploymentOption": "Single-AZ"
         }
-    )
+    ),
     
     # Test S3
-    test_service(
+    (
         "S3 - 100GB Standard",
         "/api/pricing/s3",
         {
@@ -109,10 +59,10 @@ def run_diagnostic_tests():
             "region": "US East (N. Virginia)",
             "storageGB": 100
         }
-    )
+    ),
     
     # Test VPC
-    test_service(
+    (
         "VPC - NAT Gateway",
         "/api/pricing/vpc",
         {
@@ -120,27 +70,97 @@ def run_diagnostic_tests():
             "region": "US East (N. Virginia)",
             "quantity": 1
         }
-    )
+    ),
     
     # Test ALB
-    test_service(
+    (
         "ALB - Application Load Balancer",
         "/api/pricing/alb",
         {
             "region": "US East (N. Virginia)",
             "quantity": 1
         }
-    )
+    ),
     
     # Test Route53
-    test_service(
+    (
         "Route53 - Hosted Zone",
         "/api/pricing/route53",
         {
             "component": "HostedZone",
             "quantity": 1
         }
-    )
+    ),
+)
+
+def test_service(name, endpoint, payload):
+    """Test a single service and return its detailed results as printable text"""
+    lines = []
+    report = lines.append
+    report(f"\n{'='*60}")
+    report(f"Testing: {name}")
+    report(f"{'='*60}")
+    report(f"Endpoint: {endpoint}")
+    report(f"Payload: {orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode()}")
+    
+    try:
+        response = SESSION.post(f"{BASE_URL}{endpoint}", json=payload, timeout=10)
+        report(f"\nHTTP Status: {response.status_code}")
+        
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+            success = data.get('success')
+            report(f"Success: {success}")
+            
+            if success:
+                pricing_data = data.get('data', [])
+                report(f"Records returned: {len(pricing_data)}")
+                
+                if pricing_data:
+                    first = pricing_data[0]
+                    report(f"\nFirst result:")
+                    report(orjson.dumps(first, option=orjson.OPT_INDENT_2).decode())
+                    
+                    # Check for $0 pricing
+                    prices = first.get('prices')
+                    if prices:
+                        price = prices[0]
+                        amount = price.get('amount', '0')
+                        monthly = price.get('monthly_cost', 0)
+                        report(f"\n💰 Hourly Price: ${amount}")
+                        if monthly:
+                            report(f"💰 Monthly Cost: ${monthly}")
+                        
+                        # Only parse the hourly amount when there's no monthly cost
+                        if monthly == 0 and float(amount) == 0:
+                            report("⚠️  WARNING: Pricing is $0!")
+                    else:
+                        report("⚠️  WARNING: No pricing information!")
+                else:
+                    report("❌ ERROR: No pricing data returned!")
+            else:
+                report(f"❌ ERROR: {data.get('error')}")
+        else:
+            report(f"❌ HTTP Error: {response.text[:200]}")
+            
+    except Exception as e:
+        report(f"❌ Exception: {e}")
+    
+    report(f"{'='*60}\n")
+    return '\n'.join(lines)
+
+
+def run_diagnostic_tests():
+    """Run comprehensive diagnostic tests"""
+    print(f"\n{'#'*60}")
+    print("AWS PRICING CALCULATOR - COMPREHENSIVE DIAGNOSTIC TESTS")
+    print(f"{'#'*60}\n")
+    
+    # The services are independent, so test them concurrently and print the
+    # results in order
+    with ThreadPoolExecutor(max_workers=len(TEST_CASES)) as executor:
+        for result in executor.map(lambda case: test_service(*case), TEST_CASES):
+            print(result)
     
     print(f"\n{'#'*60}")
     print("DIAGNOSTIC TESTS COMPLETE")
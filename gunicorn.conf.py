@@ -0,0 +1,41 @@
+"""
+Gunicorn configuration for the AWS Pricing Calculator
+
+Usage: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+import boto3
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+# Import the app once in the master so the pricing client and its bulk pricing
+# data are built a single time and shared with forked workers copy-on-write,
+# rather than re-parsed into a private copy by every worker
+preload_app = True
+
+
+def when_ready(server):
+    """Resolve API vs bulk pricing in the master so bulk data loads before forking"""
+    from app import pricing_client
+
+    if pricing_client and pricing_client.use_bulk_pricing:
+        # Load pricing and build the lazy lookup tables here too, so workers share them
+        pricing_client.bulk_client.warmup()
+
+
+def post_fork(server, worker):
+    """Give each worker its own boto3 client and prewarm its pricing cache"""
+    from app import pricing_client, start_pricing_prewarm
+    from aws_pricing import BOTO_CONFIG
+
+    # Connection pools aren't fork-safe
+    if pricing_client and pricing_client.client is not None:
+        pricing_client.client = boto3.client(
+            'pricing',
+            region_name=pricing_client.client.meta.region_name,
+            config=BOTO_CONFIG
+        )
+    start_pricing_prewarm()
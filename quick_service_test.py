@@ -1,74 +1,98 @@
 """
 Quick Service Test - Test all 6 services
 """
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
 import requests
-import json
 
 BASE_URL = "http://localhost:5000"
 
+# One pooled connection to the server for every request the script makes
+SESSION = requests.Session()
+
+# (name, endpoint, payload) for each service
+TEST_CASES = (
+    # Test EC2
+    ("EC2", "/api/pricing/ec2", {
+        "instanceType": "t2.micro",
+        "region": "US East (N. Virginia)",
+        "operatingSystem": "Linux",
+        "tenancy": "Shared"
+    }),
+
+    # Test RDS
+    ("RDS", "/api/pricing/rds", {
+        "instanceType": "db.t3.micro",
+        "region": "US East (N. Virginia)",
+        "databaseEngine": "MySQL",
+        "deploymentOption": "Single-AZ"
+    }),
+
+    # Test S3
+    ("S3", "/api/pricing/s3", {
+        "storageClass": "General Purpose",
+        "region": "US East (N. Virginia)",
+        "storageGB": 100
+    }),
+
+    # Test VPC
+    ("VPC", "/api/pricing/vpc", {
+        "component": "NatGateway",
+        "region": "US East (N. Virginia)",
+        "quantity": 1
+    }),
+
+    # Test ALB
+    ("ALB", "/api/pricing/alb", {
+        "region": "US East (N. Virginia)",
+        "quantity": 1
+    }),
+
+    # Test Route53
+    ("Route53", "/api/pricing/route53", {
+        "component": "HostedZone",
+        "quantity": 1
+    }),
+)
+
 def test_service(name, endpoint, payload):
-    print(f"\n{'='*50}")
-    print(f"Testing: {name}")
-    print(f"{'='*50}")
+    """Test one service and return the result lines as printable text"""
+    lines = []
+    report = lines.append
+    report(f"\n{'='*50}")
+    report(f"Testing: {name}")
+    report(f"{'='*50}")
     try:
-        r = requests.post(f'{BASE_URL}{endpoint}', json=payload, timeout=10)
-        data = r.json()
-        print(f"Status: {r.status_code}")
-        print(f"Success: {data.get('success')}")
-        if data.get('success') and data.get('data'):
-            price_info = data['data'][0]['prices'][0]
-            print(f"✅ Price: ${price_info.get('amount')}/hr")
-            monthly = price_info.get('monthly_cost', float(price_info.get('amount', 0)) * 730)
-            print(f"✅ Monthly: ${monthly:.2f}")
+        r = SESSION.post(f'{BASE_URL}{endpoint}', json=payload, timeout=10)
+        data = orjson.loads(r.content)
+        report(f"Status: {r.status_code}")
+        report(f"Success: {data.get('success')}")
+        pricing_data = data.get('data')
+        if data.get('success') and pricing_data:
+            price_info = pricing_data[0]['prices'][0]
+            amount = price_info.get('amount')
+            report(f"✅ Price: ${amount}/hr")
+            # Estimate from the hourly price only when no monthly cost was returned
+            if 'monthly_cost' in price_info:
+                monthly = price_info['monthly_cost']
+            else:
+                monthly = float(price_info.get('amount', 0)) * 730
+            report(f"✅ Monthly: ${monthly:.2f}")
         else:
-            print(f"❌ Error: {data.get('error', 'No pricing data')}")
+            report(f"❌ Error: {data.get('error', 'No pricing data')}")
     except Exception as e:
-        print(f"❌ Exception: {e}")
+        report(f"❌ Exception: {e}")
+    return '\n'.join(lines)
 
 print("\n🧪 TESTING ALL 6 AWS SERVICES")
 print("Region: US East (N. Virginia)\n")
 
-# Test EC2
-test_service("EC2", "/api/pricing/ec2", {
-    "instanceType": "t2.micro",
-    "region": "US East (N. Virginia)",
-    "operatingSystem": "Linux",
-    "tenancy": "Shared"
-})
-
-# Test RDS
-test_service("RDS", "/api/pricing/rds", {
-    "instanceType": "db.t3.micro",
-    "region": "US East (N. Virginia)",
-    "databaseEngine": "MySQL",
-    "deploymentOption": "Single-AZ"
-})
-
-# Test S3
-test_service("S3", "/api/pricing/s3", {
-    "storageClass": "General Purpose",
-    "region": "US East (N. Virginia)",
-    "storageGB": 100
-})
-
-# Test VPC
-test_service("VPC", "/api/pricing/vpc", {
-    "component": "NatGateway",
-    "region": "US East (N. Virginia)",
-    "quantity": 1
-})
-
-# Test ALB
-test_service("ALB", "/api/pricing/alb", {
-    "region": "US East (N. Virginia)",
-    "quantity": 1
-})
-
-# Test Route53
-test_service("Route53", "/api/pricing/route53", {
-    "component": "HostedZone",
-    "quantity": 1
-})
+# The services are independent, so test them concurrently and print the
+# results in order
+with ThreadPoolExecutor(max_workers=len(TEST_CASES)) as executor:
+    for result in executor.map(lambda case: test_service(*case), TEST_CASES):
+        print(result)
 
 print("\n" + "="*50)
 print("TEST COMPLETE")
@@ -5,9 +5,92 @@ Generates professional, readable cost reports in CSV format.
 """
 
 import csv
+import functools
 import io
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Dict
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Resource rows are formatted directly rather than through csv.writer; cells
+# go through _csv_cell so the output matches csv.writer's minimal quoting
+_RESOURCE_ROW = '{},{},{},{},{},${:.4f}/hr,{},{}\r\n'.format
+
+# Resource rows are joined and yielded in blocks of this many
+_ROWS_PER_CHUNK = 256
+
+
+def _csv_cell(value: Any) -> str:
+    """Render one CSV cell the way csv.writer does, quoting only when needed"""
+    text = '' if value is None else str(value)
+    if '"' in text:
+        return '"' + text.replace('"', '""') + '"'
+    if ',' in text or '\n' in text or '\r' in text:
+        return '"' + text + '"'
+    return text
+
+
+def _csv_block(rows: List[List[str]]) -> str:
+    """Render rows with csv.writer, for the report sections fixed at import"""
+    output = io.StringIO()
+    csv.writer(output).writerows(rows)
+    return output.getvalue()
+
+
+# ==================== HEADER SECTION ====================
+# Up to the first resource row; filled in with str.format per report
+_REPORT_HEADER = _csv_block([
+    ['AWS COST ESTIMATE REPORT'],
+    ['Generated', '{generated}'],
+    ['Total Resources', '{count}'],
+    [],
+    ['RESOURCE BREAKDOWN'],
+    [],
+    ['Service', 'Resource', 'Specifications', 'Region', 'Qty', 'Hourly Rate', 'Monthly Cost', 'Annual Cost'],
+    ['-' * 15, '-' * 20, '-' * 40, '-' * 25, '-' * 5, '-' * 12, '-' * 15, '-' * 15]
+])
+
+# ==================== COST SUMMARY ====================
+# The cost cells are pre-escaped with _csv_cell
+_COST_SUMMARY = _csv_block([
+    [],
+    ['COST SUMMARY'],
+    [],
+    ['Period', 'Total Cost'],
+    ['-' * 20, '-' * 20],
+    ['Monthly', '{monthly}'],
+    ['Annual', '{annual}'],
+    []
+])
+
+# Headings of the breakdowns by service and by region
+_SERVICE_HEADING = _csv_block([
+    ['COST BY SERVICE'],
+    [],
+    ['Service', 'Resources', 'Monthly Cost', 'Annual Cost'],
+    ['-' * 15, '-' * 12, '-' * 15, '-' * 15]
+])
+_REGION_HEADING = _csv_block([
+    ['COST BY REGION'],
+    [],
+    ['Region', 'Resources', 'Monthly Cost', 'Annual Cost'],
+    ['-' * 30, '-' * 12, '-' * 15, '-' * 15]
+])
+
+# ==================== IMPORTANT NOTES AND FOOTER ====================
+_REPORT_FOOTER = _csv_block([
+    ['IMPORTANT NOTES'],
+    [],
+    ['1. Pricing Basis', 'On-Demand pricing (no reservations or savings plans)'],
+    ['2. Monthly Hours', '730 hours (365 days ÷ 12 months × 24 hours)'],
+    ['3. Currency', 'USD (United States Dollars)'],
+    ['4. Exclusions', 'Data transfer, requests, and additional service-specific charges'],
+    ['5. Accuracy', 'Estimates based on official AWS pricing as of January 2026'],
+    ['6. Actual Costs', 'May vary based on usage patterns, reserved instances, and volume discounts'],
+    [],
+    ['Report generated by AWS Cost Calculator'],
+    ['For the most accurate pricing, please consult the official AWS Pricing Calculator'],
+    ['https://calculator.aws/']
+])
 
 
 def generate_csv_report(cart_items: List[Dict], total_cost: float) -> str:
@@ -21,88 +104,103 @@ def generate_csv_report(cart_items: List[Dict], total_cost: float) -> str:
     Returns:
         CSV content as string with proper formatting
     """
+    return ''.join(iter_csv_report(cart_items, total_cost))
+
+
+def empty_csv_report() -> str:
+    """
+    Generate the report for an empty cart.
+    
+    Only the timestamp varies between empty reports, so the rest is rendered
+    once and reused.
+    
+    Returns:
+        CSV content as string
+    """
+    head, tail = _empty_report_sections()
+    return f'{head}{datetime.now().strftime("%Y-%m-%d %H:%M:%S")}{tail}'
+
+
+@functools.lru_cache(maxsize=1)
+def _empty_report_sections() -> Tuple[str, str]:
+    """Split the empty-cart report around its Generated timestamp"""
+    report = generate_csv_report([], 0.0)
+    head, sep, rest = report.partition('Generated,')
+    return head + sep, rest[rest.index('\r\n'):]
+
+
+def iter_csv_report(cart_items: List[Dict], total_cost: float) -> Iterator[str]:
+    """
+    Generate the CSV report incrementally, one section or block of resource rows at a time.
+    
+    Args:
+        cart_items: List of cart items with pricing data
+        total_cost: Total monthly cost
+        
+    Yields:
+        Chunks of CSV content, suitable for a streaming response
+    """
     output = io.StringIO()
     writer = csv.writer(output)
     
-    # ==================== HEADER SECTION ====================
-    writer.writerow(['AWS COST ESTIMATE REPORT'])
-    writer.writerow(['Generated', datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
-    writer.writerow(['Total Resources', len(cart_items)])
-    writer.writerow([])
+    def flush() -> str:
+        """Return the buffered CSV text and reset the buffer"""
+        chunk = output.getvalue()
+        output.seek(0)
+        output.truncate(0)
+        return chunk
     
-    # ==================== RESOURCE DETAILS ====================
-    writer.writerow(['RESOURCE BREAKDOWN'])
-    writer.writerow([])
+    yield _REPORT_HEADER.format(
+        generated=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        count=len(cart_items)
+    )
     
-    # Column headers with clear separation
-    writer.writerow([
-        'Service',
-        'Resource',
-        'Specifications',
-        'Region',
-        'Qty',
-        'Hourly Rate',
-        'Monthly Cost',
-        'Annual Cost'
-    ])
-    
-    # Separator row
-    writer.writerow(['-' * 15, '-' * 20, '-' * 40, '-' * 25, '-' * 5, '-' * 12, '-' * 15, '-' * 15])
-    
-    # Cart items with clear formatting
+    # Cart items with clear formatting, grouped by service and region as they go by
     annual_total = 0
+    service_costs = defaultdict(int)
+    service_counts = defaultdict(int)
+    region_costs = defaultdict(int)
+    region_counts = defaultdict(int)
+    rows = []
     for item in cart_items:
-        service = item.get('service', 'N/A')
-        resource_type = item.get('resourceType', 'N/A')
-        specs = item.get('specifications', 'N/A')
-        region = item.get('region', 'N/A')
-        quantity = item.get('quantity', 1)
-        hourly_cost = item.get('hourlyCost', 0)
-        monthly_cost = item.get('monthlyCost', 0)
+        item_get = item.get
+        service = item_get('service', 'N/A')
+        resource_type = item_get('resourceType', 'N/A')
+        specs = item_get('specifications', 'N/A')
+        region = item_get('region', 'N/A')
+        quantity = item_get('quantity', 1)
+        hourly_cost = item_get('hourlyCost', 0)
+        monthly_cost = item_get('monthlyCost', 0)
         annual_cost = monthly_cost * 12
         annual_total += annual_cost
+        service_costs[service] += monthly_cost
+        service_counts[service] += 1
+        region_costs[region] += monthly_cost
+        region_counts[region] += 1
         
-        writer.writerow([
-            service,
-            resource_type,
-            specs,
-            region,
-            quantity,
-            f'${hourly_cost:.4f}/hr',
-            f'${monthly_cost:,.2f}',
-            f'${annual_cost:,.2f}'
-        ])
+        rows.append(_RESOURCE_ROW(
+            _csv_cell(service),
+            _csv_cell(resource_type),
+            _csv_cell(specs),
+            _csv_cell(region),
+            _csv_cell(quantity),
+            hourly_cost,
+            _csv_cell(f'${monthly_cost:,.2f}'),
+            _csv_cell(f'${annual_cost:,.2f}')
+        ))
+        if len(rows) == _ROWS_PER_CHUNK:
+            yield ''.join(rows)
+            rows.clear()
+    if rows:
+        yield ''.join(rows)
     
-    writer.writerow([])
-    
-    # ==================== COST SUMMARY ====================
-    writer.writerow(['COST SUMMARY'])
-    writer.writerow([])
-    writer.writerow(['Period', 'Total Cost'])
-    writer.writerow(['-' * 20, '-' * 20])
-    writer.writerow(['Monthly', f'${total_cost:,.2f}'])
-    writer.writerow(['Annual', f'${total_cost * 12:,.2f}'])
-    writer.writerow([])
+    yield _COST_SUMMARY.format(
+        monthly=_csv_cell(f'${total_cost:,.2f}'),
+        annual=_csv_cell(f'${total_cost * 12:,.2f}')
+    )
     
     # ==================== BREAKDOWN BY SERVICE ====================
-    writer.writerow(['COST BY SERVICE'])
-    writer.writerow([])
-    writer.writerow(['Service', 'Resources', 'Monthly Cost', 'Annual Cost'])
-    writer.writerow(['-' * 15, '-' * 12, '-' * 15, '-' * 15])
-    
-    # Group by service
-    service_costs = {}
-    service_counts = {}
-    for item in cart_items:
-        service = item.get('service', 'N/A')
-        monthly = item.get('monthlyCost', 0)
-        
-        if service not in service_costs:
-            service_costs[service] = 0
-            service_counts[service] = 0
-        
-        service_costs[service] += monthly
-        service_counts[service] += 1
+    output.write(_SERVICE_HEADING)
     
     # Write service breakdown
     for service in sorted(service_costs.keys()):
@@ -118,26 +216,10 @@ def generate_csv_report(cart_items: List[Dict], total_cost: float) -> str:
         ])
     
     writer.writerow([])
+    yield flush()
     
     # ==================== BREAKDOWN BY REGION ====================
-    writer.writerow(['COST BY REGION'])
-    writer.writerow([])
-    writer.writerow(['Region', 'Resources', 'Monthly Cost', 'Annual Cost'])
-    writer.writerow(['-' * 30, '-' * 12, '-' * 15, '-' * 15])
-    
-    # Group by region
-    region_costs = {}
-    region_counts = {}
-    for item in cart_items:
-        region = item.get('region', 'N/A')
-        monthly = item.get('monthlyCost', 0)
-        
-        if region not in region_costs:
-            region_costs[region] = 0
-            region_counts[region] = 0
-        
-        region_costs[region] += monthly
-        region_counts[region] += 1
+    output.write(_REGION_HEADING)
     
     # Write region breakdown
     for region in sorted(region_costs.keys()):
@@ -153,24 +235,9 @@ def generate_csv_report(cart_items: List[Dict], total_cost: float) -> str:
         ])
     
     writer.writerow([])
+    yield flush()
     
-    # ==================== IMPORTANT NOTES ====================
-    writer.writerow(['IMPORTANT NOTES'])
-    writer.writerow([])
-    writer.writerow(['1. Pricing Basis', 'On-Demand pricing (no reservations or savings plans)'])
-    writer.writerow(['2. Monthly Hours', '730 hours (365 days ÷ 12 months × 24 hours)'])
-    writer.writerow(['3. Currency', 'USD (United States Dollars)'])
-    writer.writerow(['4. Exclusions', 'Data transfer, requests, and additional service-specific charges'])
-    writer.writerow(['5. Accuracy', 'Estimates based on official AWS pricing as of January 2026'])
-    writer.writerow(['6. Actual Costs', 'May vary based on usage patterns, reserved instances, and volume discounts'])
-    writer.writerow([])
-    
-    # ==================== FOOTER ====================
-    writer.writerow(['Report generated by AWS Cost Calculator'])
-    writer.writerow(['For the most accurate pricing, please consult the official AWS Pricing Calculator'])
-    writer.writerow(['https://calculator.aws/'])
-    
-    return output.getvalue()
+    yield _REPORT_FOOTER
 
 
 def format_cart_item_for_export(item: Dict) -> Dict:
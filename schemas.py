@@ -0,0 +1,115 @@
+"""
+Request Schemas for AWS Pricing Calculator
+
+Typed views of the JSON request bodies accepted by the API. Each body is
+parsed once into a dataclass, applying defaults and numeric conversions in a
+single pass instead of scattered data.get()/float()/int() calls.
+"""
+
+import functools
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_REGION = 'US East (N. Virginia)'
+
+
+def _key(json_key: str, default: Any):
+    """Declare a field read from a differently-named JSON key"""
+    return field(default=default, metadata={'key': json_key})
+
+
+@dataclass(frozen=True)
+class EC2Query:
+    instance_type: str = _key('instanceType', 't2.micro')
+    region: str = DEFAULT_REGION
+    operating_system: str = _key('operatingSystem', 'Linux')
+    tenancy: str = 'Shared'
+
+
+@dataclass(frozen=True)
+class RDSQuery:
+    instance_type: str = _key('instanceType', 'db.t3.micro')
+    region: str = DEFAULT_REGION
+    database_engine: str = _key('databaseEngine', 'MySQL')
+    deployment_option: str = _key('deploymentOption', 'Single-AZ')
+
+
+@dataclass(frozen=True)
+class S3Query:
+    storage_class: str = _key('storageClass', 'General Purpose')
+    region: str = DEFAULT_REGION
+    storage_gb: float = _key('storageGB', 0.0)
+
+
+@dataclass(frozen=True)
+class VPCQuery:
+    component: str = 'NatGateway'
+    region: str = DEFAULT_REGION
+    quantity: int = 1
+
+
+@dataclass(frozen=True)
+class ALBQuery:
+    region: str = DEFAULT_REGION
+    quantity: int = 1
+
+
+@dataclass(frozen=True)
+class Route53Query:
+    component: str = 'HostedZone'
+    quantity: int = 1
+
+
+@dataclass(frozen=True)
+class CartItemRequest:
+    service: Optional[str] = None
+    resource_type: Optional[str] = _key('resourceType', None)
+    specifications: Any = None
+    region: Optional[str] = None
+    quantity: Any = 1
+    hourly_cost: float = _key('hourlyCost', 0.0)
+    monthly_cost: float = _key('monthlyCost', 0.0)
+
+    def to_cart_item(self, item_id: str) -> Dict:
+        """Build the session cart entry for this item"""
+        return {
+            'id': item_id,
+            'service': self.service,
+            'resourceType': self.resource_type,
+            'specifications': self.specifications,
+            'region': self.region,
+            'quantity': self.quantity,
+            'hourlyCost': self.hourly_cost,
+            'monthlyCost': self.monthly_cost
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def _field_specs(cls) -> Tuple[Tuple[str, str, Any], ...]:
+    """(attribute, JSON key, numeric converter or None) for each field of cls"""
+    return tuple(
+        (f.name, f.metadata.get('key', f.name), f.type if f.type in (int, float) else None)
+        for f in fields(cls)
+    )
+
+
+def parse(cls, data: Optional[Dict]):
+    """
+    Parse a JSON request body into a request dataclass.
+
+    Args:
+        cls: Request dataclass to build
+        data: Decoded JSON body (missing keys fall back to the field defaults)
+
+    Returns:
+        Instance of cls
+
+    Raises:
+        ValueError: If a numeric field can't be converted
+    """
+    values = {}
+    for name, key, convert in _field_specs(cls):
+        if data and key in data:
+            value = data[key]
+            values[name] = convert(value) if convert else value
+    return cls(**values)
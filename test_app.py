@@ -9,14 +9,63 @@ Tests all major functionality including:
 - Error handling
 """
 
-import requests
-import json
+import atexit
+import contextlib
+import functools
+import io
+import itertools
+import os
+import sys
 import time
-from typing import Dict, List
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+    _loads = json.loads
+    
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
 # Configuration
-BASE_URL = "http://localhost:5000"
+BASE_URL = "http://127.0.0.1:5000"  # IPv4 literal: no name lookup or IPv6 fallback per request
 TIMEOUT = 120  # Longer timeout for bulk pricing downloads
+# (connect, read) timeouts: connecting to a local server is near-instant,
+# only reads can take long
+CONNECT_TIMEOUT = 0.5
+FAST_TIMEOUT = (CONNECT_TIMEOUT, 5)
+EXPORT_TIMEOUT = (CONNECT_TIMEOUT, 10)
+BULK_TIMEOUT = (CONNECT_TIMEOUT, TIMEOUT)
+PING_TIMEOUT = (0.2, 1)
+# Token the server was started with, for the admin-only cache flush
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+SLOWEST_COUNT = 5  # Slowest tests listed in the summary
+# Collect each group's output and write it in one go; TEST_BUFFERED=0 prints
+# every line as it happens, for watching a run live
+BUFFERED = os.environ.get("TEST_BUFFERED", "1") == "1"
+# Request bodies are encoded once at import and sent as-is
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@functools.lru_cache(maxsize=1)
+def get_session():
+    """
+    The pooled session used for every request, created on first use so that
+    importing this module doesn't load requests. It also carries the server's
+    session cookie, which holds the cart, from one test to the next.
+    """
+    import requests
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=20, max_retries=0))
+    # Bodies cross loopback, where decompressing them costs more than the bytes saved
+    session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "identity"})
+    atexit.register(session.close)
+    return session
 
 
 class Colors:
@@ -29,359 +78,532 @@ class Colors:
     BOLD = '\033[1m'
 
 
+# Fixed pieces of the test output, formatted once
+RULE = '=' * 70
+BOLD_RULE = f"{Colors.BOLD}{RULE}{Colors.RESET}"
+TESTING_TAG = f"{Colors.BLUE}Testing:{Colors.RESET}"
+PASS_TAG = f"{Colors.GREEN}✓ PASS{Colors.RESET}"
+FAIL_TAG = f"{Colors.RED}✗ FAIL{Colors.RESET}"
+ERROR_TAG = f"{Colors.RED}✗ ERROR{Colors.RESET}"
+SUMMARY_HEADER = f"\n{RULE}\n{Colors.BOLD}TEST SUMMARY{Colors.RESET}\n{RULE}"
+FAILED_TESTS_HEADER = f"{Colors.RED}Failed Tests:{Colors.RESET}"
+
+
+@contextlib.contextmanager
+def thread_pool(max_workers: int):
+    """
+    ThreadPoolExecutor that, on Ctrl-C, cancels its queued work and returns
+    at once instead of waiting for every submitted test to finish first.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    interrupted = False
+    try:
+        yield executor
+    except KeyboardInterrupt:
+        interrupted = True
+        raise
+    finally:
+        executor.shutdown(wait=not interrupted, cancel_futures=interrupted)
+
+
 class TestRunner:
     """Test runner with results tracking"""
     
     def __init__(self):
         self.passed = 0
         self.failed = 0
-        self.tests = []
+        self.tests = deque()
+        self.out = io.StringIO() if BUFFERED else sys.stdout
+    
+    def flush(self):
+        """Write out everything buffered since the last flush"""
+        if BUFFERED:
+            sys.stdout.write(self.out.getvalue())
+            self.out = io.StringIO()
+        sys.stdout.flush()
     
     def test(self, name: str, func):
         """Run a single test"""
-        print(f"\n{Colors.BLUE}Testing:{Colors.RESET} {name}...")
+        print(f"\n{TESTING_TAG} {name}...", file=self.out)
+        self.record(name, self._outcome(func))
+    
+    def test_concurrently(self, tests: Sequence[Tuple[str, Callable]]):
+        """Run independent (name, func) tests at once, reporting them in the given order"""
+        with thread_pool(len(tests)) as executor:
+            outcomes = [executor.submit(self._outcome, func) for _, func in tests]
+            for (name, _), outcome in zip(tests, outcomes):
+                print(f"\n{TESTING_TAG} {name}...", file=self.out)
+                self.record(name, outcome.result())
+    
+    def run(self, tests: Sequence[Tuple[str, Callable, bool]]):
+        """Run registered (name, func, parallel) tests in order, running each run of consecutive parallel ones at once"""
+        for parallel, batch in itertools.groupby(tests, key=lambda t: t[2]):
+            batch = [(name, func) for name, func, _ in batch]
+            if parallel:
+                self.test_concurrently(batch)
+            else:
+                for name, func in batch:
+                    self.test(name, func)
+    
+    @staticmethod
+    def _outcome(func) -> Tuple[str, Optional[str], int]:
+        """Run a test function, returning its status (PASS, FAIL or ERROR), error message and duration in ns"""
+        start = time.perf_counter_ns()
         try:
             func()
-            print(f"{Colors.GREEN}✓ PASS{Colors.RESET}")
-            self.passed += 1
-            self.tests.append((name, True, None))
         except AssertionError as e:
-            print(f"{Colors.RED}✗ FAIL{Colors.RESET}: {str(e)}")
-            self.failed += 1
-            self.tests.append((name, False, str(e)))
+            status, error = 'FAIL', str(e)
         except Exception as e:
-            print(f"{Colors.RED}✗ ERROR{Colors.RESET}: {str(e)}")
+            status, error = 'ERROR', str(e)
+        else:
+            status, error = 'PASS', None
+        return status, error, time.perf_counter_ns() - start
+    
+    def record(self, name: str, outcome: Tuple[str, Optional[str], int]):
+        """Print and count the outcome of a test"""
+        status, error, elapsed_ns = outcome
+        if status == 'PASS':
+            print(PASS_TAG, file=self.out)
+            self.passed += 1
+            self.tests.append((name, True, None, elapsed_ns))
+        elif status == 'FAIL':
+            print(f"{FAIL_TAG}: {error}", file=self.out)
+            self.failed += 1
+            self.tests.append((name, False, error, elapsed_ns))
+        else:
+            print(f"{ERROR_TAG}: {error}", file=self.out)
             self.failed += 1
-            self.tests.append((name, False, f"Exception: {str(e)}"))
+            self.tests.append((name, False, f"Exception: {error}", elapsed_ns))
     
     def print_summary(self):
         """Print test summary"""
         total = self.passed + self.failed
-        print(f"\n{'='*70}")
-        print(f"{Colors.BOLD}TEST SUMMARY{Colors.RESET}")
-        print(f"{'='*70}")
-        print(f"Total Tests: {total}")
-        print(f"{Colors.GREEN}Passed: {self.passed}{Colors.RESET}")
-        print(f"{Colors.RED}Failed: {self.failed}{Colors.RESET}")
-        print(f"Success Rate: {(self.passed/total*100):.1f}%" if total > 0 else "N/A")
-        print(f"{'='*70}\n")
+        print(SUMMARY_HEADER, file=self.out)
+        print(f"Total Tests: {total}", file=self.out)
+        print(f"{Colors.GREEN}Passed: {self.passed}{Colors.RESET}", file=self.out)
+        print(f"{Colors.RED}Failed: {self.failed}{Colors.RESET}", file=self.out)
+        rate = (self.passed / total * 100) if total else 0.0
+        print(f"Success Rate: {rate:.1f}%", file=self.out)
+        print(f"{RULE}\n", file=self.out)
         
-        if self.failed > 0:
-            print(f"{Colors.RED}Failed Tests:{Colors.RESET}")
-            for name, passed, error in self.tests:
-                if not passed:
-                    print(f"  - {name}: {error}")
+        failed_tests = [t for t in self.tests if not t[1]]
+        if failed_tests:
+            print(FAILED_TESTS_HEADER, file=self.out)
+            for name, _, error, _ in failed_tests:
+                print(f"  - {name}: {error}", file=self.out)
+        
+        if self.tests:
+            print(f"\n{Colors.BOLD}Slowest tests:{Colors.RESET}", file=self.out)
+            for name, _, _, elapsed_ns in sorted(self.tests, key=lambda t: t[3], reverse=True)[:SLOWEST_COUNT]:
+                print(f"  {elapsed_ns / 1e6:9.1f} ms  {name}", file=self.out)
 
 
 # Initialize test runner
 runner = TestRunner()
 
+# (name, func, parallel) for each test in a group, in registration order
+REGISTRY: Dict[str, List[Tuple[str, Callable, bool]]] = defaultdict(list)
+
+
+def test_case(group: str, name: Optional[str] = None, parallel: bool = False):
+    """
+    Register a test under a group of run_all_tests.
+    
+    Args:
+        group: Group the test runs in
+        name: Name reported for the test (defaults to its docstring)
+        parallel: Whether the test is independent of its neighbours and may
+            run at the same time as them
+    """
+    def wrap(func):
+        REGISTRY[group].append((name or func.__doc__.strip().rstrip('.'), func, parallel))
+        return func
+    return wrap
+
+
+def _json(response) -> Dict:
+    """Decode a JSON response body"""
+    return _loads(response.content)
+
 
 def assert_response_ok(response, message=""):
     """Assert HTTP response is successful"""
     assert response.status_code == 200, f"HTTP {response.status_code}: {message}"
 
 
-def assert_json_success(data: Dict):
-    """Assert JSON response indicates success"""
-    assert data.get('success') == True, f"API returned success=False: {data.get('error', 'Unknown error')}"
+def check(response, *, expect_success=True) -> Dict:
+    """Assert an HTTP 200 response, decode its JSON body once and, unless told otherwise, assert success"""
+    assert response.status_code == 200, f"HTTP {response.status_code}: {response.text[:200]}"
+    data = _json(response)
+    if expect_success:
+        assert data.get('success') == True, f"API returned success=False: {data.get('error', 'Unknown error')}"
+    return data
 
 
 # ==================== CONNECTION TESTS ====================
 
+@test_case("connection", "Server Running", parallel=True)
 def test_server_running():
     """Test that server is running"""
-    response = requests.get(f"{BASE_URL}/", timeout=5)
+    response = get_session().get(f"{BASE_URL}/", timeout=FAST_TIMEOUT)
     assert_response_ok(response, "Server not responding")
     assert "AWS Cost Calculator" in response.text
 
 
+@test_case("connection", "Connection Status API", parallel=True)
 def test_connection_status():
     """Test AWS connection endpoint"""
-    response = requests.get(f"{BASE_URL}/api/test-connection", timeout=5)
-    assert_response_ok(response)
-    data = response.json()
+    response = get_session().get(f"{BASE_URL}/api/test-connection", timeout=FAST_TIMEOUT)
+    data = check(response, expect_success=False)
     # May succeed or fail depending on credentials, just verify it responds
     assert 'success' in data
 
 
 # ==================== PRICING API TESTS ====================
 
-def test_ec2_pricing():
-    """Test EC2 pricing query"""
-    payload = {
+# Request body for each service's pricing test, also used to warm the cache
+PRICING_QUERIES = {
+    "ec2": {
         "instanceType": "t2.micro",
         "region": "US East (N. Virginia)",
         "operatingSystem": "Linux",
         "tenancy": "Shared"
+    },
+    "rds": {
+        "instanceType": "db.t3.micro",
+        "region": "US East (N. Virginia)",
+        "databaseEngine": "MySQL",
+        "deploymentOption": "Single-AZ"
+    },
+    "s3": {
+        "storageClass": "General Purpose",
+        "region": "US East (N. Virginia)",
+        "storageGB": 100
+    },
+    "vpc": {
+        "component": "NatGateway",
+        "region": "US East (N. Virginia)",
+        "quantity": 1
+    },
+    "alb": {
+        "region": "US East (N. Virginia)",
+        "quantity": 1
+    },
+    "route53": {
+        "component": "HostedZone",
+        "quantity": 1
     }
-    print("  (First query may take 30-60s to download pricing data...)")
-    response = requests.post(f"{BASE_URL}/api/pricing/ec2", json=payload, timeout=TIMEOUT)
-    assert_response_ok(response)
-    data = response.json()
-    assert_json_success(data)
+}
+
+PRICING_BODIES = {service: _dumps(query) for service, query in PRICING_QUERIES.items()}
+
+BATCH_BODY = _dumps({
+    "queries": [
+        {"service": "ec2", "instanceType": "t2.micro", "region": "US East (N. Virginia)"},
+        {"service": "s3", "storageClass": "General Purpose", "storageGB": 100},
+        {"service": "route53", "component": "HostedZone", "quantity": 1}
+    ]
+})
+
+
+def warm_pricing_cache():
+    """Send each pricing query once, concurrently, so the pricing tests hit a warm server cache"""
+    import requests
+    
+    def warm(service):
+        try:
+            get_session().post(f"{BASE_URL}/api/pricing/{service}", data=PRICING_BODIES[service], headers=JSON_HEADERS, timeout=BULK_TIMEOUT)
+        except requests.RequestException:
+            pass  # The test for this service will report the failure
+    
+    with thread_pool(len(PRICING_QUERIES)) as executor:
+        list(executor.map(warm, PRICING_QUERIES))
+
+
+@test_case("pricing", "EC2 Pricing Query", parallel=True)
+def test_ec2_pricing():
+    """Test EC2 pricing query"""
+    response = get_session().post(f"{BASE_URL}/api/pricing/ec2", data=PRICING_BODIES["ec2"], headers=JSON_HEADERS, timeout=BULK_TIMEOUT)
+    data = check(response)
     assert 'data' in data
     assert 'count' in data
 
 
+@test_case("pricing", "RDS Pricing Query", parallel=True)
 def test_rds_pricing():
     """Test RDS pricing query"""
-    payload = {
-        "instanceType": "db.t3.micro",
-        "region": "US East (N. Virginia)",
-        "databaseEngine": "MySQL",
-        "deploymentOption": "Single-AZ"
-    }
-    print("  (May take time if RDS pricing not cached...)")
-    response = requests.post(f"{BASE_URL}/api/pricing/rds", json=payload, timeout=TIMEOUT)
-    assert_response_ok(response)
-    data = response.json()
-    assert_json_success(data)
+    response = get_session().post(f"{BASE_URL}/api/pricing/rds", data=PRICING_BODIES["rds"], headers=JSON_HEADERS, timeout=BULK_TIMEOUT)
+    check(response)
 
 
+@test_case("pricing", "S3 Pricing Query", parallel=True)
 def test_s3_pricing():
     """Test S3 pricing query"""
-    payload = {
-        "storageClass": "General Purpose",
-        "region": "US East (N. Virginia)",
-        "storageGB": 100
-    }
-    response = requests.post(f"{BASE_URL}/api/pricing/s3", json=payload, timeout=TIMEOUT)
-    assert_response_ok(response)
-    data = response.json()
-    assert_json_success(data)
+    response = get_session().post(f"{BASE_URL}/api/pricing/s3", data=PRICING_BODIES["s3"], headers=JSON_HEADERS, timeout=BULK_TIMEOUT)
+    check(response)
 
 
+@test_case("pricing", "VPC Pricing Query", parallel=True)
 def test_vpc_pricing():
     """Test VPC pricing query"""
-    payload = {
-        "component": "NatGateway",
-        "region": "US East (N. Virginia)",
-        "quantity": 1
-    }
-    response = requests.post(f"{BASE_URL}/api/pricing/vpc", json=payload, timeout=TIMEOUT)
-    assert_response_ok(response)
-    data = response.json()
+    response = get_session().post(f"{BASE_URL}/api/pricing/vpc", data=PRICING_BODIES["vpc"], headers=JSON_HEADERS, timeout=BULK_TIMEOUT)
+    data = check(response, expect_success=False)
     # VPC pricing might not always return data, just verify API works
     assert 'success' in data
 
 
+@test_case("pricing", "ALB Pricing Query", parallel=True)
 def test_alb_pricing():
     """Test ALB pricing query"""
-    payload = {
-        "region": "US East (N. Virginia)",
-        "quantity": 1
-    }
-    response = requests.post(f"{BASE_URL}/api/pricing/alb", json=payload, timeout=TIMEOUT)
-    assert_response_ok(response)
-    data = response.json()
+    response = get_session().post(f"{BASE_URL}/api/pricing/alb", data=PRICING_BODIES["alb"], headers=JSON_HEADERS, timeout=BULK_TIMEOUT)
+    data = check(response, expect_success=False)
     assert 'success' in data
 
 
+@test_case("pricing", "Route53 Pricing Query", parallel=True)
 def test_route53_pricing():
     """Test Route53 pricing query"""
-    payload = {
-        "component": "HostedZone",
-        "quantity": 1
-    }
-    response = requests.post(f"{BASE_URL}/api/pricing/route53", json=payload, timeout=TIMEOUT)
-    assert_response_ok(response)
-    data = response.json()
+    response = get_session().post(f"{BASE_URL}/api/pricing/route53", data=PRICING_BODIES["route53"], headers=JSON_HEADERS, timeout=BULK_TIMEOUT)
+    data = check(response, expect_success=False)
     assert 'success' in data
 
 
+@test_case("pricing", "Batch Pricing Query")
+def test_batch_pricing():
+    """Test batched pricing queries across services"""
+    response = get_session().post(f"{BASE_URL}/api/pricing/batch", data=BATCH_BODY, headers=JSON_HEADERS, timeout=BULK_TIMEOUT)
+    data = check(response)
+    assert len(data['results']) == 3, f"Expected 3 results, got {len(data['results'])}"
+
+
+@test_case("pricing", "Flush Pricing Cache")
+def test_cache_flush():
+    """Test flushing the pricing cache"""
+    if not ADMIN_TOKEN:
+        # Without a token the endpoint must refuse to flush
+        response = get_session().post(f"{BASE_URL}/api/cache/flush", timeout=FAST_TIMEOUT)
+        assert response.status_code == 403, f"HTTP {response.status_code}: flush allowed without a token"
+        return
+    response = get_session().post(
+        f"{BASE_URL}/api/cache/flush", headers={"X-Admin-Token": ADMIN_TOKEN}, timeout=FAST_TIMEOUT
+    )
+    check(response)
+
+
 # ==================== CART TESTS ====================
 
+CART_ITEM_BODY = _dumps({
+    "service": "EC2",
+    "resourceType": "t2.micro",
+    "specifications": "1 vCPU, 1GB RAM, Linux",
+    "region": "US East (N. Virginia)",
+    "quantity": 1,
+    "hourlyCost": 0.0116,
+    "monthlyCost": 8.468
+})
+
+# Added by test_cart_add_multiple, on top of the item above
+EXTRA_CART_ITEM_BODIES = tuple(_dumps(item) for item in (
+    {
+        "service": "RDS",
+        "resourceType": "db.t3.micro",
+        "specifications": "MySQL, Single-AZ",
+        "region": "US East (N. Virginia)",
+        "quantity": 1,
+        "hourlyCost": 0.017,
+        "monthlyCost": 12.41
+    },
+    {
+        "service": "S3",
+        "resourceType": "Storage",
+        "specifications": "100 GB, Standard",
+        "region": "US East (N. Virginia)",
+        "quantity": 1,
+        "hourlyCost": 0.003,
+        "monthlyCost": 2.30
+    }
+))
+
+class CartState:
+    """Last /api/cart/items payload, so later cart tests can skip fetching it again"""
+    latest_items: Optional[Dict] = None
+
+
+def get_cart_items() -> Dict:
+    """Current cart items, from CartState if nothing has changed the cart since"""
+    if CartState.latest_items is None:
+        response = get_session().get(f"{BASE_URL}/api/cart/items", timeout=FAST_TIMEOUT)
+        CartState.latest_items = _json(response)
+    return CartState.latest_items
+
+
+@test_case("cart", "Clear Cart")
 def test_cart_clear():
     """Test clearing cart"""
-    response = requests.delete(f"{BASE_URL}/api/cart/clear", timeout=5)
-    assert_response_ok(response)
-    data = response.json()
-    assert_json_success(data)
+    response = get_session().delete(f"{BASE_URL}/api/cart/clear", timeout=FAST_TIMEOUT)
+    CartState.latest_items = None
+    check(response)
 
 
+@test_case("cart", "Get Empty Cart")
 def test_cart_empty():
     """Test getting empty cart"""
-    response = requests.get(f"{BASE_URL}/api/cart/items", timeout=5)
-    assert_response_ok(response)
-    data = response.json()
-    assert_json_success(data)
+    response = get_session().get(f"{BASE_URL}/api/cart/items", timeout=FAST_TIMEOUT)
+    data = CartState.latest_items = check(response)
     assert data['count'] == 0
 
 
+@test_case("cart", "Add Item to Cart")
 def test_cart_add_item():
     """Test adding item to cart"""
-    item = {
-        "service": "EC2",
-        "resourceType": "t2.micro",
-        "specifications": "1 vCPU, 1GB RAM, Linux",
-        "region": "US East (N. Virginia)",
-        "quantity": 1,
-        "hourlyCost": 0.0116,
-        "monthlyCost": 8.468
-    }
-    response = requests.post(f"{BASE_URL}/api/cart/add", json=item, timeout=5)
-    assert_response_ok(response)
-    data = response.json()
-    assert_json_success(data)
+    response = get_session().post(f"{BASE_URL}/api/cart/add", data=CART_ITEM_BODY, headers=JSON_HEADERS, timeout=FAST_TIMEOUT)
+    CartState.latest_items = None
+    data = check(response)
     assert data['cartCount'] == 1
 
 
+@test_case("cart", "Get Cart Items")
 def test_cart_get_items():
     """Test getting cart items"""
-    response = requests.get(f"{BASE_URL}/api/cart/items", timeout=5)
-    assert_response_ok(response)
-    data = response.json()
-    assert_json_success(data)
+    response = get_session().get(f"{BASE_URL}/api/cart/items", timeout=FAST_TIMEOUT)
+    data = CartState.latest_items = check(response)
     assert data['count'] >= 1
     assert len(data['items']) >= 1
 
 
+@test_case("cart", "Get Cart Total")
 def test_cart_total():
     """Test getting cart total"""
-    response = requests.get(f"{BASE_URL}/api/cart/total", timeout=5)
-    assert_response_ok(response)
-    data = response.json()
-    assert_json_success(data)
+    response = get_session().get(f"{BASE_URL}/api/cart/total", timeout=FAST_TIMEOUT)
+    data = check(response)
     assert 'total' in data
     assert data['total'] > 0
 
 
+@test_case("cart", "Add Multiple Items")
 def test_cart_add_multiple():
     """Test adding multiple items"""
-    items = [
-        {
-            "service": "RDS",
-            "resourceType": "db.t3.micro",
-            "specifications": "MySQL, Single-AZ",
-            "region": "US East (N. Virginia)",
-            "quantity": 1,
-            "hourlyCost": 0.017,
-            "monthlyCost": 12.41
-        },
-        {
-            "service": "S3",
-            "resourceType": "Storage",
-            "specifications": "100 GB, Standard",
-            "region": "US East (N. Virginia)",
-            "quantity": 1,
-            "hourlyCost": 0.003,
-            "monthlyCost": 2.30
-        }
-    ]
-    
-    for item in items:
-        response = requests.post(f"{BASE_URL}/api/cart/add", json=item, timeout=5)
+    # Added one at a time: each add reads and rewrites the session cart, so
+    # concurrent adds would race and drop items
+    for body in EXTRA_CART_ITEM_BODIES:
+        response = get_session().post(f"{BASE_URL}/api/cart/add", data=body, headers=JSON_HEADERS, timeout=FAST_TIMEOUT)
+        CartState.latest_items = None
         assert_response_ok(response)
     
     # Verify count
-    response = requests.get(f"{BASE_URL}/api/cart/items", timeout=5)
-    data = response.json()
+    data = get_cart_items()
     assert data['count'] >= 3
 
 
+@test_case("cart", "Remove Cart Item")
 def test_cart_remove_item():
     """Test removing item from cart"""
     # Get current items
-    response = requests.get(f"{BASE_URL}/api/cart/items", timeout=5)
-    data = response.json()
+    data = get_cart_items()
     
     if data['count'] > 0:
         item_id = data['items'][0]['id']
         
         # Remove the item
-        response = requests.delete(f"{BASE_URL}/api/cart/remove/{item_id}", timeout=5)
-        assert_response_ok(response)
-        result = response.json()
-        assert_json_success(result)
+        response = get_session().delete(f"{BASE_URL}/api/cart/remove/{item_id}", timeout=FAST_TIMEOUT)
+        CartState.latest_items = None
+        check(response)
 
 
 # ==================== EXPORT TESTS ====================
 
+@test_case("export", "CSV Export")
 def test_csv_export():
     """Test CSV export"""
     # First ensure cart has items
-    response = requests.get(f"{BASE_URL}/api/cart/items", timeout=5)
-    data = response.json()
+    data = get_cart_items()
     
     if data['count'] == 0:
         # Add a test item
         test_cart_add_item()
     
     # Export CSV
-    response = requests.get(f"{BASE_URL}/api/export/csv", timeout=10)
-    assert_response_ok(response)
-    assert response.headers['Content-Type'] == 'text/csv; charset=utf-8'
-    assert 'attachment' in response.headers.get('Content-Disposition', '')
-    
-    # Verify CSV content
-    csv_content = response.text
-    assert 'AWS Cost Estimate Report' in csv_content
-    assert 'Service' in csv_content
-    assert 'Total Monthly Cost' in csv_content
+    with get_session().get(f"{BASE_URL}/api/export/csv", timeout=EXPORT_TIMEOUT, stream=True) as response:
+        assert_response_ok(response)
+        content_type = response.headers.get('Content-Type', '')
+        assert content_type.lower().startswith('text/csv'), f"Unexpected Content-Type: {content_type}"
+        assert 'attachment' in response.headers.get('Content-Disposition', '').lower()
+        
+        # Verify CSV content, reading only as far as the last expected marker
+        missing = {'AWS COST ESTIMATE REPORT', 'Service', 'COST SUMMARY'}
+        for line in response.iter_lines(decode_unicode=True):
+            missing = {marker for marker in missing if marker not in line}
+            if not missing:
+                break
+    assert not missing, f"CSV is missing {sorted(missing)}"
 
 
 # ==================== ERROR HANDLING TESTS ====================
 
+@test_case("error", "404 Not Found", parallel=True)
 def test_invalid_endpoint():
     """Test 404 error handling"""
-    response = requests.get(f"{BASE_URL}/api/nonexistent", timeout=5)
+    # HEAD gets the same 404 without transferring the error page
+    response = get_session().head(f"{BASE_URL}/api/nonexistent", timeout=FAST_TIMEOUT)
     assert response.status_code == 404
 
 
+@test_case("error", "Invalid Cart Remove", parallel=True)
 def test_invalid_cart_remove():
     """Test removing non-existent cart item"""
-    response = requests.delete(f"{BASE_URL}/api/cart/remove/invalid-id", timeout=5)
+    response = get_session().delete(f"{BASE_URL}/api/cart/remove/invalid-id", timeout=FAST_TIMEOUT)
     assert_response_ok(response)
     # Should succeed but not actually remove anything
 
 
 # ==================== RUN ALL TESTS ====================
 
+# (group, heading) in run order. Connection, the six service pricing queries
+# and error handling are independent, and so marked parallel; the cart tests
+# build on each other and run in registration order.
+TEST_GROUPS = (
+    ("connection", "CONNECTION TESTS"),
+    ("pricing", "PRICING API TESTS"),
+    ("cart", "CART FUNCTIONALITY TESTS"),
+    ("export", "EXPORT TESTS"),
+    ("error", "ERROR HANDLING TESTS"),
+)
+
 def run_all_tests():
     """Run complete test suite"""
-    print(f"\n{Colors.BOLD}{'='*70}{Colors.RESET}")
+    import requests
+    
+    print(f"\n{BOLD_RULE}")
     print(f"{Colors.BOLD}AWS PRICING CALCULATOR - AUTOMATED TEST SUITE{Colors.RESET}")
-    print(f"{Colors.BOLD}{'='*70}{Colors.RESET}")
+    print(BOLD_RULE)
     print(f"\nTesting server at: {BASE_URL}")
     print(f"Timeout: {TIMEOUT}s")
     print(f"\n{Colors.YELLOW}Note: First-time pricing queries may take 30-60s to download data{Colors.RESET}")
     
-    # Connection Tests
-    print(f"\n{Colors.BOLD}--- CONNECTION TESTS ---{Colors.RESET}")
-    runner.test("Server Running", test_server_running)
-    runner.test("Connection Status API", test_connection_status)
-    
-    # Pricing API Tests
-    print(f"\n{Colors.BOLD}--- PRICING API TESTS ---{Colors.RESET}")
-    runner.test("EC2 Pricing Query", test_ec2_pricing)
-    runner.test("RDS Pricing Query", test_rds_pricing)
-    runner.test("S3 Pricing Query", test_s3_pricing)
-    runner.test("VPC Pricing Query", test_vpc_pricing)
-    runner.test("ALB Pricing Query", test_alb_pricing)
-    runner.test("Route53 Pricing Query", test_route53_pricing)
-    
-    # Cart Tests
-    print(f"\n{Colors.BOLD}--- CART FUNCTIONALITY TESTS ---{Colors.RESET}")
-    runner.test("Clear Cart", test_cart_clear)
-    runner.test("Get Empty Cart", test_cart_empty)
-    runner.test("Add Item to Cart", test_cart_add_item)
-    runner.test("Get Cart Items", test_cart_get_items)
-    runner.test("Get Cart Total", test_cart_total)
-    runner.test("Add Multiple Items", test_cart_add_multiple)
-    runner.test("Remove Cart Item", test_cart_remove_item)
-    
-    # Export Tests
-    print(f"\n{Colors.BOLD}--- EXPORT TESTS ---{Colors.RESET}")
-    runner.test("CSV Export", test_csv_export)
+    # Fail fast instead of running every test against a server that isn't up
+    try:
+        get_session().get(f"{BASE_URL}/", timeout=PING_TIMEOUT)
+    except requests.ConnectionError:
+        raise RuntimeError(f"No server responding at {BASE_URL}; start it with 'python app.py'")
+    except requests.ReadTimeout:
+        pass  # Up but slow to answer; the tests will report on it
     
-    # Error Handling Tests
-    print(f"\n{Colors.BOLD}--- ERROR HANDLING TESTS ---{Colors.RESET}")
-    runner.test("404 Not Found", test_invalid_endpoint)
-    runner.test("Invalid Cart Remove", test_invalid_cart_remove)
+    for group, heading in TEST_GROUPS:
+        if group == "pricing":
+            # Load pricing on the server first, so the pricing tests run against the warm cache
+            print(f"\n{Colors.BOLD}--- WARMING PRICING CACHE ---{Colors.RESET}")
+            print("  (First queries may take 30-60s to download pricing data...)")
+            warm_pricing_cache()
+        
+        print(f"\n{Colors.BOLD}--- {heading} ---{Colors.RESET}", file=runner.out)
+        try:
+            runner.run(REGISTRY[group])
+        finally:
+            runner.flush()
     
     # Print summary
     runner.print_summary()
+    runner.flush()
     
     return runner.passed, runner.failed
 
@@ -391,11 +613,11 @@ if __name__ == "__main__":
         passed, failed = run_all_tests()
         
         # Exit with appropriate code
-        exit(0 if failed == 0 else 1)
+        sys.exit(0 if failed == 0 else 1)
         
     except KeyboardInterrupt:
         print(f"\n\n{Colors.YELLOW}Tests interrupted by user{Colors.RESET}")
-        exit(130)
+        sys.exit(130)
     except Exception as e:
         print(f"\n\n{Colors.RED}Fatal error: {e}{Colors.RESET}")
-        exit(1)
+        sys.exit(1)